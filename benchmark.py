@@ -0,0 +1,259 @@
+"""time the analysis hot paths on the design-0.py and design-final.py geometries
+
+usage:
+    python benchmark.py                                  write benchmark_results.json
+    python benchmark.py -o new.json --compare old.json   also compare against an earlier run, exits 1 on a regression
+    python benchmark.py --quick --filter solve           fewer repeats, only benchmarks containing 'solve'
+"""
+import argparse
+import contextlib
+import copy
+import io
+import json
+import os
+import platform
+import runpy
+import statistics
+import sys
+import time
+
+import matplotlib
+matplotlib.use('Agg')  # noqa, graphs are drawn without a window
+
+import numpy as np
+
+import bridgeplotlib
+from src import analysis, geometry_collection, train
+
+DESIGNS = tuple(os.path.join(os.path.dirname(os.path.abspath(__file__)), design)
+                for design in ('design-0.py', 'design-final.py'))
+SOLVE_SETTINGS = ((10, 2000), (1, 2000), (1, 500), (0.1, 2000))  # (movement_increment, SUBDIVISIONS)
+REGRESSION_THRESHOLD = 1.2  # ratio of median times reported as a regression
+
+
+def load_design(path: str) -> tuple:
+    """run a design script with its output hidden, recording the arguments of every geometry collection it builds
+
+    Args:
+        path (str): path of the design script
+
+    Returns:
+        (object, list): Bridge object of the design, [(name, args, kwargs), ...] copied before each collection was built
+    """
+    collections = []
+    init = geometry_collection.GeometryCollection.__init__
+
+    def record(self, *args, **kwargs):
+        collections.append(copy.deepcopy((args, kwargs)))
+        init(self, *args, **kwargs)
+        collections[-1] = (self.name, *collections[-1])
+
+    geometry_collection.GeometryCollection.__init__ = record
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            namespace = runpy.run_path(path, run_name='__benchmark__')
+    finally:
+        geometry_collection.GeometryCollection.__init__ = init
+        bridgeplotlib.plt.close('all')
+
+    return namespace['b'], collections
+
+
+def time_function(function, repeat: int, number=1, setup=None) -> dict:
+    """time a function
+
+    Args:
+        function (Callable): function to time, given the return of setup if there is one
+        repeat (int): how many times to time it
+        number (int, optional): calls per timing, the time is divided by it. Defaults to 1.
+        setup (Callable, optional): called before every call and not timed. Defaults to None.
+
+    Returns:
+        dict: min, median and mean seconds per call, and the repeat
+    """
+    times = []
+    for _ in range(repeat):
+        total = 0
+        for _ in range(number):
+            args = (setup(),) if setup else ()
+            start = time.perf_counter()
+            function(*args)
+            total += time.perf_counter()-start
+        times.append(total/number)
+
+    return {'min': min(times), 'median': statistics.median(times), 'mean': statistics.mean(times), 'repeat': repeat}
+
+
+def build_collection(arguments: tuple) -> object:
+    """build a geometry collection and find everything it finds when first used
+
+    Args:
+        arguments (tuple): (args, kwargs) of the geometry collection
+
+    Returns:
+        object: the geometry collection
+    """
+    collection = geometry_collection.GeometryCollection(
+        *arguments[0], **arguments[1])
+    collection.I, collection.top, collection.bottom, collection.area
+    getattr(collection, 'side_shear', None)
+
+    return collection
+
+
+def get_benchmarks(design: str, Bridge: object, collections: list) -> list:
+    """get the benchmarks of a design
+
+    Args:
+        design (str): name of the design
+        Bridge (object): Bridge object
+        collections (list): recorded geometry collections from load_design
+
+    Returns:
+        list: [(name, function, setup, number), ...]
+    """
+    benchmarks = []
+
+    seen = {}
+    for name, args, kwargs in collections:
+        seen[name] = seen.get(name, -1)+1
+        label = name if not seen[name] else f'{name}#{seen[name]}'
+        benchmarks.append((f'{design}:GeometryCollection.__init__[{label}]', build_collection,
+                           lambda args=args, kwargs=kwargs: copy.deepcopy((args, kwargs)), 5))
+
+    for movement_increment, subdivisions in SOLVE_SETTINGS:
+        def solve(movement_increment=movement_increment, subdivisions=subdivisions):
+            default, bridgeplotlib.SUBDIVISIONS = bridgeplotlib.SUBDIVISIONS, subdivisions
+            try:
+                bridgeplotlib.solve_maximum_forces(
+                    Bridge, 400, movement_increment, cache=False)
+            finally:
+                bridgeplotlib.SUBDIVISIONS = default
+        benchmarks.append(
+            (f'{design}:solve_maximum_forces[increment={movement_increment},subdivisions={subdivisions}]', solve, None, 1))
+
+    x = [val for val in Bridge.get_sample_points()
+         if Bridge.cross_sections.get_cross_section_type(val) != 'diaphragm']
+
+    t = train.Train(120, 400)
+
+    def sweep(method, *args):
+        Bridge.solve_shear_force(t.get_wheel_positions(), t.get_point_loads())
+        for val in x:
+            method(val, *(arg(val) if callable(arg) else arg for arg in args))
+
+    def section(val):
+        return Bridge.cross_sections.get_cross_section(val)
+
+    sweeps = (('get_max_force_flexural', Bridge.get_max_force_flexural, lambda val: section(val).top),
+              ('get_max_force_shear', Bridge.get_max_force_shear,
+               lambda val: section(val).centroid),
+              ('get_max_force_tpb_top_flange', Bridge.get_max_force_tpb_top_flange),
+              ('get_max_force_tpb_side_flange', Bridge.get_max_force_tpb_side_flange),
+              ('get_max_force_tpb_vertical_flange', Bridge.get_max_force_tpb_vertical_flange),
+              ('get_max_force_tps', Bridge.get_max_force_tps))
+
+    Bridge.solve_shear_force(t.get_wheel_positions(), t.get_point_loads())
+    for name, method, *args in sweeps:
+        try:
+            method(x[0], *(arg(x[0]) for arg in args))
+        except (ValueError, AttributeError, ZeroDivisionError):
+            continue  # the design has no plates of this kind
+        benchmarks.append(
+            (f'{design}:Bridge.{name}[x={len(x)}]', lambda method=method, args=args: sweep(method, *args), None, 1))
+
+    Envelope = bridgeplotlib.solve_maximum_forces(Bridge, 400, 1)
+
+    benchmarks.append((f'{design}:analysis.analyze', lambda: analysis.analyze(
+        Bridge, Envelope), None, 5))
+
+    def display():
+        with contextlib.redirect_stdout(io.StringIO()):
+            bridgeplotlib.display_graphs((bridgeplotlib.graph_max_flexural, bridgeplotlib.graph_max_shear,
+                                          bridgeplotlib.graph_max_thin_plate_buckling,
+                                          bridgeplotlib.graph_max_thin_plate_shear), 2, 2, 4, Bridge, Envelope)
+        bridgeplotlib.plt.close('all')
+
+    benchmarks.append((f'{design}:display_graphs', display, None, 1))
+
+    return benchmarks
+
+
+def run(designs=DESIGNS, repeat=5, filter=None) -> dict:
+    """run every benchmark of the designs
+
+    Args:
+        designs (Iterable, optional): paths of the design scripts. Defaults to DESIGNS.
+        repeat (int, optional): times each benchmark is timed. Defaults to 5.
+        filter (str, optional): only run benchmarks with this in their name. Defaults to None.
+
+    Returns:
+        dict: results with the machine and package versions
+    """
+    results = {}
+    for path in designs:
+        design = os.path.splitext(os.path.basename(path))[0]
+        Bridge, collections = load_design(path)
+
+        for name, function, setup, number in get_benchmarks(design, Bridge, collections):
+            if filter and filter not in name:
+                continue
+            results[name] = time_function(function, repeat, number, setup)
+            print(f'{name}: {results[name]["median"]*1000:.3f}ms', flush=True)
+
+    return {'python': platform.python_version(), 'numpy': np.__version__, 'matplotlib': matplotlib.__version__,
+            'machine': platform.platform(), 'processor': platform.processor(), 'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'results': results}
+
+
+def compare(old: dict, new: dict, threshold=REGRESSION_THRESHOLD) -> list:
+    """print the change in median time of every benchmark in both runs
+
+    Args:
+        old (dict): earlier results from run
+        new (dict): later results from run
+        threshold (float, optional): ratio of median times counted as a regression. Defaults to REGRESSION_THRESHOLD.
+
+    Returns:
+        list: names of the regressed benchmarks
+    """
+    regressions = []
+    for name, result in new['results'].items():
+        if name not in old['results']:
+            continue
+        ratio = result['median']/old['results'][name]['median']
+        flag = ''
+        if ratio > threshold:
+            regressions.append(name)
+            flag = '  REGRESSION'
+        print(
+            f'{name}: {old["results"][name]["median"]*1000:.3f}ms -> {result["median"]*1000:.3f}ms ({ratio:.2f}x){flag}')
+
+    return regressions
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='time the analysis hot paths on the shipped designs')
+    parser.add_argument('-o', '--output', default='benchmark_results.json',
+                        help='file to write the results to')
+    parser.add_argument('--compare', help='earlier results to compare against')
+    parser.add_argument('--threshold', type=float, default=REGRESSION_THRESHOLD,
+                        help='ratio of median times counted as a regression')
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='times each benchmark is timed')
+    parser.add_argument('--quick', action='store_true',
+                        help='time each benchmark once')
+    parser.add_argument('--filter', help='only run benchmarks with this in their name')
+    args = parser.parse_args()
+
+    new = run(repeat=1 if args.quick else args.repeat, filter=args.filter)
+
+    with open(args.output, 'w') as file:
+        json.dump(new, file, indent=2)
+
+    if args.compare:
+        with open(args.compare) as file:
+            old = json.load(file)
+        if compare(old, new, args.threshold):
+            sys.exit(1)
@@ -46,16 +46,16 @@ b = bridge.Bridge(1200, cross_sections)
 
 
 
-# solve_maximum_forces(b, 400, single_position=120) # train at center
-solve_maximum_forces(b, 400, single_position=0) # train at corner/start
-# solve_maximum_forces(b, 400, 1)  # all possible positions
+# forces = solve_maximum_forces(b, 400, single_position=120) # train at center
+forces = solve_maximum_forces(b, 400, single_position=0) # train at corner/start
+# forces = solve_maximum_forces(b, 400, 1)  # all possible positions
 
 intermediate = True
 if intermediate:
     print(f'centroid: {section.centroid:.3f}')
     print(f'I: {section.I:.3f}')
-    print(f'V max: {max(maximum_shear_forces):.3f} | ratio of P: {max(maximum_shear_forces)/400:.3f}')
-    print(f'M max: {max(maximum_bending_moments):.3f} | ratio of P: {max(maximum_bending_moments)/400:.3f}')
+    print(f'V max: {max(forces.shear_forces):.3f} | ratio of P: {max(forces.shear_forces)/400:.3f}')
+    print(f'M max: {max(forces.bending_moments):.3f} | ratio of P: {max(forces.bending_moments)/400:.3f}')
     print(f'Q glue: {section.find_Q(75):.3f}')
     print(f'b glue: {section.get_joint_width(section.get_joint_heights()[0]):.3f}')
     print(f'Q centroid: {section.find_Q(section.centroid):.3f}')
@@ -67,4 +67,4 @@ if intermediate:
     print(f'k=4 t: {section.top_flange[0][1]:.3f}, b: {section.top_flange[0][0]:.3f}')
 
 display_graphs((graph_max_flexural, graph_max_shear, graph_max_thin_plate_buckling,
-               graph_max_thin_plate_shear), 2, 2, 4, b, 400, 1)
+               graph_max_thin_plate_shear), 2, 2, 4, b, forces)
@@ -126,6 +126,6 @@ cross_sections = bridge.CrossSections(sections, bounds, types)
 
 b = bridge.Bridge(1270, cross_sections)
 
-solve_maximum_forces(b, 400, 1)
+forces = solve_maximum_forces(b, 400, 1)
 display_graphs((graph_max_flexural, graph_max_shear, graph_max_thin_plate_buckling,
-               graph_max_thin_plate_shear), 2, 2, 4, b, 400, 1)
+               graph_max_thin_plate_shear), 2, 2, 4, b, forces)
@@ -0,0 +1,298 @@
+from typing import Iterable, NamedTuple
+
+import numpy as np
+
+from src import constants, envelope
+
+
+class FailureMode(NamedTuple):
+    """the factor of safety of a bridge for one failure mode
+
+    Attributes:
+        name (str): name of the failure mode, i.e. 'Tension' or 'Thin Plate Buckling k=4'
+        fos (float): minimum factor of safety along the bridge
+        failure_load (float): train weight the bridge fails at for this mode
+        critical_x (float): x of the minimum factor of safety
+        train_position (float): left-most train position causing the force at critical_x
+        section (str): name of the cross section at critical_x
+    """
+    name: str
+    fos: float
+    failure_load: float
+    critical_x: float
+    train_position: float = np.nan
+    section: str = None
+
+
+class AnalysisReport(NamedTuple):
+    """the factors of safety of a bridge for every failure mode
+
+    Attributes:
+        modes (tuple): FailureMode of each failure mode
+        train_weight (float): weight of the train the factors of safety are for
+    """
+    modes: tuple
+    train_weight: float
+
+    def get_mode(self, name: str) -> FailureMode:
+        """get a failure mode by name
+
+        Args:
+            name (str): name of the failure mode
+
+        Returns:
+            FailureMode: the failure mode, None if nonexistent
+        """
+        for mode in self.modes:
+            if mode.name == name:
+                return mode
+
+    def get_minimum(self) -> FailureMode:
+        """get the failure mode with the lowest factor of safety
+
+        Returns:
+            FailureMode: the failure mode
+        """
+        return min(self.modes, key=lambda mode: mode.fos)
+
+    def get_scaled(self, train_weight: float) -> 'AnalysisReport':
+        """get the factors of safety for a train with a different weight, the factor of safety is inversely
+        proportional to the weight and the failure loads do not change
+
+        Args:
+            train_weight (number): weight of the train, positive
+
+        Returns:
+            AnalysisReport: the factors of safety
+        """
+        factor = self.train_weight/train_weight
+
+        return AnalysisReport(tuple(mode._replace(fos=mode.fos*factor) for mode in self.modes), train_weight)
+
+
+def analyze(Bridge: object, Envelope=None, train_weight=400, movement_increment=10, engine='influence', subdivisions=constants.SUBDIVISIONS, vehicle=None) -> AnalysisReport:
+    """find the factor of safety of every failure mode of a bridge in one pass over the envelope x values, nothing is plotted
+
+    Args:
+        Bridge (object): Bridge object
+        Envelope (EnvelopeResult, optional): envelopes to use, solved with the other arguments if not given
+        train_weight (number, optional): weight of the train. Defaults to 400.
+        movement_increment (number, optional): how much to move the train. Defaults to 10.
+        engine (str, optional): envelope engine, see envelope.solve. Defaults to 'influence'.
+        subdivisions (int, optional): how many x to solve at. Defaults to constants.SUBDIVISIONS.
+        vehicle (LoadModel, optional): axle layout of the train, see load_model. Defaults to the six axle train.
+
+    Returns:
+        AnalysisReport: factor of safety, failure load and critical x of every failure mode, get_scaled for other weights
+    """
+    if Envelope is None:
+        Envelope = envelope.solve(
+            Bridge, train_weight, movement_increment, engine=engine, subdivisions=subdivisions, vehicle=vehicle)
+
+    x = Envelope.x
+    indices = get_section_indices(Bridge, x)
+    sections = get_section_names(Bridge, x, indices)
+
+    def flexural(name, capacities):
+        return get_failure_mode(name, x, capacities, Envelope.bending_moments, Envelope.train_weight,
+                                Envelope.bending_positions, sections)
+
+    def shear(name, capacities):
+        return get_failure_mode(name, x, capacities, Envelope.shear_forces, Envelope.train_weight,
+                                Envelope.shear_positions, sections)
+
+    top, bottom = get_flexural_capacities(Bridge, x, indices)
+    modes = [flexural('Tension', bottom),
+             flexural('Compression', top),
+             shear('Shear, Centroid', get_shear_capacities(Bridge, x, indices))]
+
+    for joint, capacities in get_glue_capacities(Bridge, x, indices):
+        modes.append(
+            shear(f'Shear, Glue Joint {joint[3]} y={joint[0]}', capacities))
+
+    top, side, vertical = get_tpb_capacities(Bridge, x, indices)
+    modes += [flexural('Thin Plate Buckling k=4', top),
+              flexural('Thin Plate Buckling k=0.425', side),
+              flexural('Thin Plate Buckling k=6', vertical),
+              shear('Thin Plate Shear k=5', get_tps_capacities(Bridge, x, indices))]
+
+    return AnalysisReport(tuple(modes), Envelope.train_weight)
+
+
+def find_failure_loads(Bridge: object, movement_increment=10, engine='influence', subdivisions=constants.SUBDIVISIONS, vehicle=None) -> AnalysisReport:
+    """find the train weight each failure mode first fails at, where and for which train position, from one envelope
+
+    the forces are linear in the train weight, so the failure load of a mode is its factor of safety times the weight
+    the envelopes were solved for, no weights have to be tried
+
+    Args:
+        Bridge (object): Bridge object
+        movement_increment (number, optional): how much to move the train. Defaults to 10.
+        engine (str, optional): envelope engine, see envelope.solve. Defaults to 'influence'.
+        subdivisions (int, optional): how many x to solve at. Defaults to constants.SUBDIVISIONS.
+        vehicle (LoadModel, optional): axle layout of the train, see load_model. Defaults to the six axle train.
+
+    Returns:
+        AnalysisReport: failure load, critical x, train position and cross section of every failure mode for a train weighing 1,
+        get_minimum is the governing failure mode
+    """
+    return analyze(Bridge, train_weight=1, movement_increment=movement_increment, engine=engine,
+                   subdivisions=subdivisions, vehicle=vehicle)
+
+
+def get_failure_mode(name: str, x: Iterable, capacities: Iterable, forces: Iterable, train_weight: float, positions=None, sections=None) -> FailureMode:
+    """find the minimum factor of safety of a failure mode, x with a capacity of NaN are skipped
+
+    Args:
+        name (str): name of the failure mode
+        x (Iterable): positions along the bridge
+        capacities (Iterable): max force the bridge can hold at each x
+        forces (Iterable): force at each x caused by the train
+        train_weight (number): weight of the train causing the forces
+        positions (Iterable, optional): train position causing the force at each x, i.e. EnvelopeResult.shear_positions
+        sections (Iterable, optional): name of the cross section at each x, see get_section_names
+
+    Returns:
+        FailureMode: the failure mode
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        fos = np.abs(np.asarray(capacities)/np.asarray(forces))
+
+    if np.all(np.isnan(fos)):
+        return FailureMode(name, np.inf, np.inf, np.nan)
+
+    i = np.nanargmin(fos)
+
+    return FailureMode(name, float(fos[i]), float(fos[i]*train_weight), float(x[i]),
+                       np.nan if positions is None else float(positions[i]),
+                       None if sections is None else sections[i])
+
+
+def get_section_names(Bridge: object, x: Iterable, indices=None) -> np.ndarray:
+    """get the name of the cross section at every x
+
+    Args:
+        Bridge (object): Bridge object
+        x (Iterable): positions along the bridge
+        indices (np.ndarray, optional): cross section index at each x if already found, see get_section_indices
+
+    Returns:
+        np.ndarray: names of the cross sections
+    """
+    names = np.array([cross_section.name for cross_section in Bridge.cross_sections.cross_sections],
+                     dtype=object)
+
+    return names[__return_indices(Bridge, x, indices)]
+
+
+def get_section_indices(Bridge: object, x: Iterable) -> np.ndarray:
+    """get the index of the cross section at every x, the section map of the bridge is used for its sample points
+
+    Args:
+        Bridge (object): Bridge object
+        x (Iterable): positions along the bridge
+
+    Returns:
+        np.ndarray: cross section indices
+    """
+    if isinstance(x, np.ndarray) and x.ndim == 1 and not x.flags.writeable and x is Bridge.get_sample_points(len(x)):
+        return Bridge.get_section_map(len(x))
+
+    return Bridge.cross_sections.get_cross_section_indices(x)
+
+
+def get_flexural_capacities(Bridge: object, x: Iterable, indices=None) -> tuple:
+    """get the max bending moment the bridge can hold at every x for flexural stress, positive bending moments only
+
+    Args:
+        Bridge (object): Bridge object
+        x (Iterable): positions along the bridge
+        indices (np.ndarray, optional): cross section index at each x if already found, see get_section_indices
+
+    Returns:
+        (np.ndarray, np.ndarray): compression at the top, tension at the bottom, NaN for diaphragms
+    """
+    table = Bridge.cross_sections.get_capacity_table()
+    i = __return_indices(Bridge, x, indices)
+
+    return table.compression[i], table.tension[i]
+
+
+def get_shear_capacities(Bridge: object, x: Iterable, indices=None) -> np.ndarray:
+    """get the max shear force the bridge can hold at every x for shear stress at the centroid
+
+    Args:
+        Bridge (object): Bridge object
+        x (Iterable): positions along the bridge
+        indices (np.ndarray, optional): cross section index at each x if already found, see get_section_indices
+
+    Returns:
+        np.ndarray: max shear forces, NaN for diaphragms
+    """
+    table = Bridge.cross_sections.get_capacity_table()
+
+    return table.shear[__return_indices(Bridge, x, indices)]
+
+
+def get_glue_capacities(Bridge: object, x: Iterable, indices=None) -> list:
+    """get the max shear force the bridge can hold at every x for shear stress at each unique glue joint
+
+    Args:
+        Bridge (object): Bridge object
+        x (Iterable): positions along the bridge
+        indices (np.ndarray, optional): cross section index at each x if already found, see get_section_indices
+
+    Returns:
+        list: [(joint, max shear forces), ...], joint as given by Bridge.get_unique_joints, NaN outside of the joint bounds
+    """
+    table = Bridge.cross_sections.get_capacity_table()
+    i = __return_indices(Bridge, x, indices)
+
+    return [(joint, capacities[i]) for joint, capacities in table.glue]
+
+
+def get_tpb_capacities(Bridge: object, x: Iterable, indices=None) -> tuple:
+    """get the max bending moment the bridge can hold at every x for thin plate buckling, positive bending moments only
+
+    Args:
+        Bridge (object): Bridge object
+        x (Iterable): positions along the bridge
+        indices (np.ndarray, optional): cross section index at each x if already found, see get_section_indices
+
+    Returns:
+        (np.ndarray, np.ndarray, np.ndarray): k=4, k=0.425, k=6, NaN for diaphragms
+    """
+    table = Bridge.cross_sections.get_capacity_table()
+    i = __return_indices(Bridge, x, indices)
+
+    return table.tpb_top[i], table.tpb_side[i], table.tpb_vertical[i]
+
+
+def get_tps_capacities(Bridge: object, x: Iterable, indices=None) -> np.ndarray:
+    """get the max shear force the bridge can hold at every x for thin plate shear buckling k=5
+
+    Args:
+        Bridge (object): Bridge object
+        x (Iterable): positions along the bridge
+        indices (np.ndarray, optional): cross section index at each x if already found, see get_section_indices
+
+    Returns:
+        np.ndarray: max shear forces, NaN for diaphragms
+    """
+    table = Bridge.cross_sections.get_capacity_table()
+
+    return table.tps[__return_indices(Bridge, x, indices)]
+
+
+def __return_indices(Bridge: object, x: Iterable, indices=None) -> np.ndarray:
+    """return the cross section index at each x, found if not given
+
+    Args:
+        Bridge (object): Bridge object
+        x (Iterable): positions along the bridge
+        indices (np.ndarray, optional): cross section index at each x if already found
+
+    Returns:
+        np.ndarray: cross section indices
+    """
+    return get_section_indices(Bridge, x) if indices is None else indices
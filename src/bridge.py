@@ -1,4 +1,9 @@
-from typing import Iterable
+from typing import Callable, Iterable
+from bisect import bisect_left
+
+import numpy as np
+
+from src import capacity, constants
 
 
 class Bridge:
@@ -12,37 +17,116 @@ class Bridge:
         self.length = length
         self.cross_sections = cross_sections
 
+        self.__sample_points = {}
+        self.__section_maps = {}
+        self.__envelopes = {}
+
+    def get_sample_points(self, subdivisions=constants.SUBDIVISIONS) -> np.ndarray:
+        """get the x values forces are sampled at along the bridge, starting and ending 0.01 from the supports
+
+        Args:
+            subdivisions (int, optional): number of x values. Defaults to constants.SUBDIVISIONS.
+
+        Returns:
+            np.ndarray: x values, read only
+        """
+        if subdivisions not in self.__sample_points:
+            x = np.linspace(0.01, self.length-0.01, subdivisions)
+            x.setflags(write=False)
+            self.__sample_points[subdivisions] = x
+
+        return self.__sample_points[subdivisions]
+
+    def get_section_map(self, subdivisions=constants.SUBDIVISIONS) -> np.ndarray:
+        """get the cross section index at each of the sample points, computed once for each number of subdivisions
+
+        Args:
+            subdivisions (int, optional): number of x values. Defaults to constants.SUBDIVISIONS.
+
+        Returns:
+            np.ndarray: cross section indices, read only
+        """
+        if subdivisions not in self.__section_maps:
+            indices = self.cross_sections.get_cross_section_indices(
+                self.get_sample_points(subdivisions))
+            indices.setflags(write=False)
+            self.__section_maps[subdivisions] = indices
+
+        return self.__section_maps[subdivisions]
+
+    def check_symmetric(self) -> bool:
+        """check if the cross sections are mirrored about the middle of the bridge, see CrossSections.check_symmetric
+
+        Returns:
+            bool: True if symmetric
+        """
+        return self.cross_sections.check_symmetric(self.length)
+
+    def get_cached_envelope(self, key: tuple, solve: Callable, cache=True) -> object:
+        """get envelopes solved once for each key, see envelope.solve, only the constants.ENVELOPE_CACHE_SIZE
+        most recently used are kept
+
+        Args:
+            key (tuple): hashable description of the envelopes
+            solve (Callable): returns the envelopes if they have not been solved yet
+            cache (bool, optional): False to always solve and not keep the envelopes. Defaults to True.
+
+        Returns:
+            EnvelopeResult: the envelopes
+        """
+        if not cache:
+            return solve()
+
+        if key in self.__envelopes:
+            self.__envelopes[key] = self.__envelopes.pop(key)  # most recently used last
+        else:
+            self.__envelopes[key] = solve()
+            while len(self.__envelopes) > constants.ENVELOPE_CACHE_SIZE:
+                del self.__envelopes[next(iter(self.__envelopes))]
+
+        return self.__envelopes[key]
+
+    def clear_envelope_cache(self) -> None:
+        """forget every cached envelope, see get_cached_envelope
+        """
+        self.__envelopes.clear()
+
     def calculate_reaction_forces(self, load_positions: Iterable, loads: Iterable) -> tuple:
         """Calculates the reaction forces provided by A---------B\n
         Assumptions:
         - All point loads are downwards
         - Ignores self weight
 
+        a batch of load cases can be given as arrays with the point loads of each load case along the last axis
 
         Args:
-            load_positions (iterable): positions of point loads (mm)
+            load_positions (iterable): positions of point loads (mm), shape (point loads,) or (load cases, point loads)
             loads (iterable): force of each point load, index should match load_positions
 
         Returns:
-            tuple: (A, B)
+            tuple: (A, B), numbers for one load case, np.ndarray of each load case for a batch
         """
-        A = 0
-        B = 0
+        load_positions = np.asarray(load_positions, dtype=float)
+        loads = np.asarray(loads, dtype=float)
 
         # Sum of moments around A
-        M = 0
-        for i, pos in enumerate(load_positions):
-            M += loads[i]*pos
+        M = (loads*load_positions).sum(axis=-1)
 
         # Sum of forces
         B = M/self.length
-        A = sum(loads) - B
+        A = loads.sum(axis=-1) - B
+
+        if np.ndim(A) == 0:
+            return float(A), float(B)
 
         return A, B
 
     def solve_shear_force(self, load_positions: Iterable, loads: Iterable, reactions=False):
         """solves and stores shear force in object, uses given loads and load positions 
 
+        the bending moment at every point where the shear force changes is integrated once here,
+        so the shear force and bending moment can be looked up with a binary search afterwards
+
         Args:
             load_positions (iterable): positions of point loads (mm)
             loads (iterable): force of each point load, index should match load_positions
@@ -52,23 +136,47 @@ class Bridge:
         if not reactions:
             reactions = self.calculate_reaction_forces(load_positions, loads)
 
-        x = []
-        v = []
-
-        x.append(0)
-        v.append(reactions[0])
+        load_positions = np.asarray(load_positions, dtype=float)
+        loads = np.asarray(loads, dtype=float)
+        order = np.argsort(load_positions, kind='stable')
 
-        for i, pos in enumerate(load_positions):
-            x.append(pos)
-            v.append(v[-1]-loads[i])
+        x = np.concatenate(([0], load_positions[order], [self.length]))
+        v = reactions[0] - np.concatenate(([0], np.cumsum(loads[order])))
+        v = np.append(v, v[-1])
 
-        x.append(self.length)
-        v.append(v[-1])
+        # bending moment at each x, area under the shear force diagram
+        m = np.concatenate(([0], np.cumsum(v[:-1]*np.diff(x))))
 
         self.x_v = x
         self.v = v
+        self.m = m
+
+        self.load = loads.sum()
+
+    def get_shear_forces(self, x: Iterable) -> np.ndarray:
+        """return the shear force at every point in x, requires valid shear force array in memory
+
+        Args:
+            x (Iterable): positions from the left of the bridge
+
+        Returns:
+            np.ndarray: shear forces
+        """
+        return self.v[self.__return_segments(x)]
 
-        self.load = sum(loads)
+    def get_bending_moments(self, x: Iterable) -> np.ndarray:
+        """return the bending moment at every point in x, requires valid shear force array in memory
+
+        Args:
+            x (Iterable): positions from the left of the bridge
+
+        Returns:
+            np.ndarray: bending moments
+        """
+        x = np.asarray(x, dtype=float)
+        i = self.__return_segments(x)
+
+        return self.m[i] + self.v[i]*(x-self.x_v[i])
 
     def get_shear_force(self, x: float) -> float:
         """return the shear force at point x, requires valid shear force array in memory
@@ -79,17 +187,7 @@ class Bridge:
         Returns:
             float: shear force
         """
-        if x > self.x_v[-1]:
-            return self.x_v[-1]
-
-        if x == 0:
-            return self.x_v[0]
-
-        i = 0
-        while not (x > self.x_v[i] and x <= self.x_v[i+1]):
-            i += 1
-
-        return self.v[i]
+        return float(self.get_shear_forces(x))
 
     def get_bending_moment(self, x: float) -> float:
         """return the bending moment at point x, requires valid shear force array in memory
@@ -100,18 +198,20 @@ class Bridge:
         Returns:
             float: bending moment
         """
-        area = 0
+        return float(self.get_bending_moments(x))
 
-        i = 0
-        while not (x > self.x_v[i] and x <= self.x_v[i+1]):
-            i += 1
+    def __return_segments(self, x: Iterable) -> np.ndarray:
+        """return the index of the shear force segment each x falls within, a load at x belongs to the segment on its right
 
-        for j in range(1, i+1):
-            area += self.v[j-1]*(self.x_v[j]-self.x_v[j-1])
+        Args:
+            x (Iterable): positions from the left of the bridge
 
-        area += self.get_shear_force(x)*(x-self.x_v[i])
+        Returns:
+            np.ndarray: segment indices
+        """
+        i = np.searchsorted(self.x_v, x, side='left') - 1
 
-        return area
+        return np.clip(i, 0, len(self.v)-1)
 
     def get_flexural_stress(self, x: float, y: float) -> float:
         """get the stress due to flexing at a given x and y
@@ -333,6 +433,49 @@ class CrossSections:
         self.unique_non_diaphragm_cross_sections = self.__return_unique_cross_sections(
             cross_sections, 'diaphragm')
 
+        # interval index, bounds sorted by where they start
+        self.__order = sorted(range(len(bounds)), key=lambda i: bounds[i][0])
+        self.__lower_bounds = [bounds[i][0] for i in self.__order]
+        self.__upper_bounds = [bounds[i][1] for i in self.__order]
+
+        self.__capacity_table = None
+        self.__symmetric = {}
+
+    def check_symmetric(self, length: float) -> bool:
+        """check if the layout of the cross sections is mirrored about the middle of a bridge, every bound has a
+        bound mirrored to it (within PRECISION) with the same cross section and type, checked once for each length
+
+        Args:
+            length (number): length of the bridge
+
+        Returns:
+            bool: True if symmetric
+        """
+        if length not in self.__symmetric:
+            bounds = np.round(np.asarray(self.bounds, dtype=float).reshape(-1, 2) /
+                              constants.PRECISION).astype(np.int64)
+            end = round(length/constants.PRECISION)
+
+            layout = {(int(lower), int(upper), id(section), section_type) for (lower, upper), section, section_type in zip(
+                bounds, self.cross_sections, self.types)}
+            mirrored = {(end-upper, end-lower, section, section_type)
+                        for lower, upper, section, section_type in layout}
+
+            self.__symmetric[length] = layout == mirrored
+
+        return self.__symmetric[length]
+
+    def get_capacity_table(self) -> object:
+        """get the forces each cross section bound can hold for each failure mode, built once from the unique cross sections
+
+        Returns:
+            CapacityTable: capacity table, see capacity.build_capacity_table
+        """
+        if self.__capacity_table is None:
+            self.__capacity_table = capacity.build_capacity_table(self)
+
+        return self.__capacity_table
+
     def get_cross_section(self, x: float) -> object:
         """get the cross section at a given x
 
@@ -355,6 +498,25 @@ class CrossSections:
         """
         return self.__return_index(x)
 
+    def get_cross_section_indices(self, x: Iterable) -> np.ndarray:
+        """get the cross section index at every x
+
+        Args:
+            x (Iterable): distances from left of bridge
+
+        Returns:
+            np.ndarray: the index of the cross section at each x
+        """
+        x = np.asarray(x, dtype=float)
+        i = np.searchsorted(self.__upper_bounds, x, side='left')
+
+        outside = i == len(self.__order)
+        i = np.where(outside, 0, i)
+        if np.any(outside | (np.asarray(self.__lower_bounds)[i] > x)):
+            raise ValueError('x is not within the bounds of a cross section')
+
+        return np.asarray(self.__order)[i]
+
     def get_cross_section_type(self, x: float) -> str:
         """get the cross section type at a given x
 
@@ -387,7 +549,7 @@ class CrossSections:
         return bounds
 
     def __return_index(self, x: float) -> int:
-        """returns what index the x value falls within
+        """returns what index the x value falls within, the first bound is used if x is on the edge of two bounds
 
         Args:
             x (number): an x value
@@ -395,27 +557,13 @@ class CrossSections:
         Returns:
             number: the index
         """
-        i = 0
-        while not self.__return_bounded(x, self.bounds[i]):
-            i += 1
-
-        return i
-
-    def __return_bounded(self, x: float, bound: Iterable) -> bool:
-        """return if the x is within a bound
+        i = bisect_left(self.__upper_bounds, x)
 
-        Args:
-            x (number): an x value
-            bound (Iterable): a bound in the from (a, b)
+        if i == len(self.__order) or self.__lower_bounds[i] > x:
+            raise ValueError(
+                f'{x} is not within the bounds of a cross section')
 
-        Returns:
-            bool: True if x is within the bound
-        """
-        # print(x)
-        if x >= bound[0] and x <= bound[1]:
-            return True
-        else:
-            return False
+        return self.__order[i]
 
     def __return_unique_cross_sections(self, cross_sections: object, exclude=None) -> list:
         """return all unique cross sections in a bridge
@@ -0,0 +1,138 @@
+from typing import NamedTuple
+
+import numpy as np
+
+from src import constants
+
+
+class SectionCapacities(NamedTuple):
+    """the forces a cross section can hold for each failure mode, bending moments are positive (sagging) only
+
+    Attributes:
+        tension (float): bending moment the bottom fails in tension at
+        compression (float): bending moment the top fails in compression at
+        shear (float): shear force the centroid fails in shear at
+        tpb_top (float): bending moment of thin plate buckling k=4
+        tpb_side (float): bending moment of thin plate buckling k=0.425
+        tpb_vertical (float): bending moment of thin plate buckling k=6
+        shear_ratio (float): I*b/Q at the centroid, the shear force causing a shear stress of 1 at the centroid
+        glue (tuple): ((y, b, shear force), ...) shear force each glue joint height fails at
+    """
+    tension: float
+    compression: float
+    shear: float
+    tpb_top: float
+    tpb_side: float
+    tpb_vertical: float
+    shear_ratio: float
+    glue: tuple
+
+
+class CapacityTable(NamedTuple):
+    """the forces a bridge can hold for each failure mode, arrays are indexed by cross section bound and NaN for diaphragms
+
+    Attributes:
+        tension (np.ndarray): bending moment the bottom fails in tension at
+        compression (np.ndarray): bending moment the top fails in compression at
+        shear (np.ndarray): shear force the centroid fails in shear at
+        tpb_top (np.ndarray): bending moment of thin plate buckling k=4
+        tpb_side (np.ndarray): bending moment of thin plate buckling k=0.425
+        tpb_vertical (np.ndarray): bending moment of thin plate buckling k=6
+        tps (np.ndarray): shear force of thin plate shear buckling k=5
+        glue (tuple): ((joint, np.ndarray), ...) shear force each glue joint fails at, joint as given by Bridge.get_unique_joints
+    """
+    tension: np.ndarray
+    compression: np.ndarray
+    shear: np.ndarray
+    tpb_top: np.ndarray
+    tpb_side: np.ndarray
+    tpb_vertical: np.ndarray
+    tps: np.ndarray
+    glue: tuple
+
+
+def find_section_capacities(section: object, glue=True) -> SectionCapacities:
+    """find the forces a cross section can hold for each failure mode
+
+    Args:
+        section (GeometryCollection): cross section
+        glue (bool, optional): False to skip the glue joints, i.e. for diaphragms. Defaults to True.
+
+    Returns:
+        SectionCapacities: capacities of the cross section
+    """
+    mat_board = constants.MATERIAL_PROPERTIES['mat_board']
+
+    def buckling(flanges):
+        return min([flange.capacity*section.I/(flange.y_top-section.centroid) for flange in flanges], default=np.nan)
+
+    shear_ratio = section.I * \
+        section.find_width(section.centroid)/section.find_Q(section.centroid)
+
+    joints = []
+    if glue:
+        for joint in section.get_joint_heights():
+            y = joint[0][0][1]
+            b = section.get_joint_width(joint)
+            joints.append(
+                (y, b, constants.MATERIAL_PROPERTIES['contact_cement']['shear_strength']*section.I*b/section.find_Q(y)))
+
+    return SectionCapacities(
+        mat_board['tensile_strength']*section.I /
+        (section.centroid-section.bottom),
+        mat_board['compressive_strength']*section.I /
+        (section.top-section.centroid),
+        mat_board['shear_strength']*shear_ratio,
+        buckling(getattr(section, 'top_flange', ())),
+        buckling(getattr(section, 'side_flange', ())),
+        buckling(getattr(section, 'vertical_flange', ())),
+        shear_ratio,
+        tuple(joints))
+
+
+def build_capacity_table(cross_sections: object) -> CapacityTable:
+    """build the capacity table of a bridge, the capacities of each unique cross section are only found once
+
+    Args:
+        cross_sections (CrossSections): cross sections of the bridge
+
+    Returns:
+        CapacityTable: capacities of every cross section bound
+    """
+    n = len(cross_sections.cross_sections)
+
+    capacities = {}
+    for section in cross_sections.unique_cross_sections:
+        glue = any(section is cs for cs in cross_sections.unique_non_diaphragm_cross_sections)
+        capacities[id(section)] = find_section_capacities(section, glue)
+
+    columns = {name: np.full(n, np.nan) for name in (
+        'tension', 'compression', 'shear', 'tpb_top', 'tpb_side', 'tpb_vertical', 'tps')}
+
+    for i, (section, bound, type) in enumerate(zip(cross_sections.cross_sections, cross_sections.bounds, cross_sections.types)):
+        if type == 'diaphragm':
+            continue
+
+        section_capacities = capacities[id(section)]
+        for name in ('tension', 'compression', 'shear', 'tpb_top', 'tpb_side', 'tpb_vertical'):
+            columns[name][i] = getattr(section_capacities, name)
+
+        a = bound[1]-bound[0]+0.635
+        columns['tps'][i] = min([section.find_shear_plate_capacities(plate, a)*section_capacities.shear_ratio
+                                 for plate in getattr(section, 'side_shear', ())], default=np.nan)
+
+    glue = []
+    for section in cross_sections.unique_non_diaphragm_cross_sections:
+        bounded = np.array([cs is section and type != 'diaphragm' for cs, type in zip(
+            cross_sections.cross_sections, cross_sections.types)])
+        for y, b, shear in capacities[id(section)].glue:
+            joint = (y, b, cross_sections.get_cross_section_bounds(
+                section), section.name)
+            capacities_at_bounds = np.where(bounded, shear, np.nan)
+            capacities_at_bounds.setflags(write=False)
+            glue.append((joint, capacities_at_bounds))
+
+    for column in columns.values():
+        column.setflags(write=False)
+
+    return CapacityTable(**columns, glue=tuple(glue))
@@ -15,6 +15,10 @@ MATERIAL_PROPERTIES = {
 
 PRECISION = 0.001  # three decimal points of precision
 
+SUBDIVISIONS = 2000  # points along the bridge forces are solved at
+
+ENVELOPE_CACHE_SIZE = 32  # unit weight envelopes kept by each bridge, least recently used are dropped first
+
 TESTING_SETUP ={
     'supports': 50,  # mm, on each side
     'min_span': 1250, # mm
@@ -0,0 +1,155 @@
+from typing import Iterable, NamedTuple
+
+import numpy as np
+
+from src import constants, envelope, influence, load_model
+
+
+class DeflectionResult(NamedTuple):
+    """the deflection of a bridge for every train position, positive downwards, all arrays are read only
+
+    Attributes:
+        x (np.ndarray): positions along the bridge, see get_deflection_points
+        positions (np.ndarray): left-most train positions
+        deflections (np.ndarray): deflection at each x for each train position, shape (positions, x)
+        midspan (np.ndarray): deflection at the middle of the bridge for each train position
+        maximum (np.ndarray): largest deflection for each train position
+        maximum_x (np.ndarray): x of the largest deflection for each train position
+        envelope (np.ndarray): largest deflection at each x of any train position
+        envelope_positions (np.ndarray): train position causing the largest deflection at each x
+        train_weight (float): weight of the train
+    """
+    x: np.ndarray
+    positions: np.ndarray
+    deflections: np.ndarray
+    midspan: np.ndarray
+    maximum: np.ndarray
+    maximum_x: np.ndarray
+    envelope: np.ndarray
+    envelope_positions: np.ndarray
+    train_weight: float
+
+
+def solve(Bridge: object, train_weight=400, movement_increment=10, single_position=None, subdivisions=constants.SUBDIVISIONS,
+          vehicle=None, E=constants.MATERIAL_PROPERTIES['mat_board']['E']) -> DeflectionResult:
+    """solve the deflection of a bridge for every train position at once by integrating the curvature M/(E*I) twice
+
+    I only changes at the bounds of the cross sections and the bending moment is linear between points close enough
+    together, so the curvature is taken as linear between the x values and integrated exactly, the bounds are
+    x values so no segment straddles a change of I
+
+    if the bridge, the train turned around and the train positions are mirrored about the middle of the bridge,
+    only the first half of the positions are solved, the rest are the mirrored deflections
+
+    Args:
+        Bridge (object): Bridge object
+        train_weight (number, optional): weight of the train. Defaults to 400.
+        movement_increment (number, optional): how much to move the train. Defaults to 10.
+        single_position (number, optional): only solve for the train at this position
+        subdivisions (int, optional): how many evenly spaced x to solve at, the bounds and middle are added. Defaults to constants.SUBDIVISIONS.
+        vehicle (LoadModel, optional): axle layout of the train, see load_model. Defaults to the six axle train.
+        E (number, optional): Young's modulus in MPa. Defaults to the E of mat board.
+
+    Returns:
+        DeflectionResult: the deflections in mm
+    """
+    if single_position != None:
+        positions = np.array((single_position,), dtype=float)
+    else:
+        positions = envelope.get_train_positions(movement_increment)
+
+    if vehicle is None:
+        vehicle = load_model.get_train()
+    vehicle = vehicle.get_scaled(train_weight)
+
+    x = get_deflection_points(Bridge, subdivisions)
+    EI = E*get_segment_I(Bridge, x)
+
+    mirrored = Bridge.check_symmetric() and vehicle.check_symmetric() and np.allclose(
+        positions+positions[::-1], Bridge.length-vehicle.length, rtol=0, atol=constants.PRECISION)
+    solved = positions[:(len(positions)+1)//2] if mirrored else positions
+
+    lines = influence.InfluenceLines(Bridge.length, x)
+    M = lines.get_forces(solved, vehicle.offsets, vehicle.loads)[1]
+
+    deflections = -integrate_curvature(x, M[:, :-1]/EI, M[:, 1:]/EI)
+    if mirrored:
+        deflections = np.concatenate(
+            (deflections, deflections[:len(positions)//2][::-1, ::-1]))
+
+    maximum_i = deflections.argmax(axis=1)
+    envelope_i = deflections.argmax(axis=0)
+
+    arrays = (x, positions, deflections, deflections[:, np.searchsorted(x, Bridge.length/2)],
+              deflections[np.arange(len(positions)), maximum_i], x[maximum_i],
+              deflections[envelope_i, np.arange(len(x))], positions[envelope_i])
+    for array in arrays:
+        array.setflags(write=False)
+
+    return DeflectionResult(*arrays, train_weight)
+
+
+def get_deflection_points(Bridge: object, subdivisions=constants.SUBDIVISIONS) -> np.ndarray:
+    """get the x values deflections are found at, evenly spaced with the supports, the middle and every cross section bound added,
+    the x values of a symmetric bridge are the left half and its mirror
+
+    Args:
+        Bridge (object): Bridge object
+        subdivisions (int, optional): number of evenly spaced x values. Defaults to constants.SUBDIVISIONS.
+
+    Returns:
+        np.ndarray: sorted x values
+    """
+    bounds = np.asarray(Bridge.cross_sections.bounds, dtype=float).reshape(-1)
+    x = np.concatenate((np.linspace(0, Bridge.length, subdivisions),
+                        bounds, (Bridge.length/2,)))
+
+    x = np.unique(np.clip(x, 0, Bridge.length))
+
+    if Bridge.check_symmetric():
+        left = x[x <= Bridge.length/2]
+        x = np.concatenate((left, Bridge.length-left[-2::-1]))
+
+    return x
+
+
+def get_segment_I(Bridge: object, x: Iterable) -> np.ndarray:
+    """get the I of the cross section between each pair of consecutive x values
+
+    Args:
+        Bridge (object): Bridge object
+        x (Iterable): sorted x values containing every cross section bound
+
+    Returns:
+        np.ndarray: I of each segment, shape (len(x)-1,)
+    """
+    x = np.asarray(x, dtype=float)
+    I = np.array([cross_section.I for cross_section in Bridge.cross_sections.cross_sections], dtype=float)
+
+    return I[Bridge.cross_sections.get_cross_section_indices((x[:-1]+x[1:])/2)]
+
+
+def integrate_curvature(x: Iterable, start: np.ndarray, end: np.ndarray) -> np.ndarray:
+    """integrate a curvature that is linear within each segment twice, with zero deflection at the first and last x
+
+    Args:
+        x (Iterable): sorted x values
+        start (np.ndarray): curvature at the start of each segment, shape (..., len(x)-1)
+        end (np.ndarray): curvature at the end of each segment, shape (..., len(x)-1)
+
+    Returns:
+        np.ndarray: deflection at each x, positive in the direction of positive curvature, shape (..., len(x))
+    """
+    x = np.asarray(x, dtype=float)
+    h = np.diff(x)
+
+    slopes = np.cumsum(h*(start+end)/2, axis=-1)
+    slopes = np.concatenate(
+        (np.zeros(slopes.shape[:-1]+(1,)), slopes), axis=-1)
+
+    deflections = np.cumsum(h*slopes[..., :-1] + h**2*(2*start+end)/6, axis=-1)
+    deflections = np.concatenate(
+        (np.zeros(deflections.shape[:-1]+(1,)), deflections), axis=-1)
+
+    # rotate so both supports have no deflection
+    return deflections - (x-x[0])/(x[-1]-x[0])*deflections[..., -1:]
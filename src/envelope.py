@@ -0,0 +1,345 @@
+from typing import Iterable, NamedTuple
+
+import numpy as np
+
+from src import constants, influence, load_model
+
+
+class EnvelopeResult(NamedTuple):
+    """the maximum forces a train imparts on a bridge, all arrays are read only and indexed by x
+
+    Attributes:
+        x (np.ndarray): positions along the bridge
+        shear_forces (np.ndarray): shear force envelope
+        bending_moments (np.ndarray): bending moment envelope
+        shear_positions (np.ndarray): left-most train position governing the shear force at each x
+        bending_positions (np.ndarray): left-most train position governing the bending moment at each x
+        train_weight (float): weight of the train
+    """
+    x: np.ndarray
+    shear_forces: np.ndarray
+    bending_moments: np.ndarray
+    shear_positions: np.ndarray
+    bending_positions: np.ndarray
+    train_weight: float
+
+    def get_scaled(self, train_weight: float) -> 'EnvelopeResult':
+        """get the envelopes of the same train with a different weight, the forces are linear in the weight
+        so the governing train positions do not change
+
+        Args:
+            train_weight (number): weight of the train, positive
+
+        Returns:
+            EnvelopeResult: the envelopes
+        """
+        factor = train_weight/self.train_weight
+
+        forces = []
+        for array in (self.shear_forces, self.bending_moments):
+            array = array*factor
+            array.setflags(write=False)
+            forces.append(array)
+
+        return EnvelopeResult(self.x, *forces, self.shear_positions, self.bending_positions, train_weight)
+
+
+def solve(Bridge: object, train_weight=400, movement_increment=10, single_position=None, engine='influence', subdivisions=constants.SUBDIVISIONS, vehicle=None, symmetry=True, cache=True) -> EnvelopeResult:
+    """solve for the maximum forces that a train will impart on a bridge, and the train positions they occur at
+
+    the envelopes of a train weighing 1 are solved once for each bridge length, axle layout, set of train positions and x,
+    and kept by the bridge, see Bridge.get_cached_envelope, every weight is found by scaling them
+
+    the forces of a train that is the same turned around are mirrored about the middle of the bridge when the train is
+    at the mirrored position, so the 'influence' engine only solves the left half of the x values for the train positions
+    and their mirrors, unless that is no less work than solving every x
+
+    Args:
+        Bridge (object): Bridge object
+        train_weight (number, optional): weight of the train. Defaults to 400.
+        movement_increment (number, optional): how much to move the train, can be less than 1, not used by the 'exact' engine. Defaults to 10.
+        single_position (number, optional): only solve for the train at this position
+        engine (str, optional): 'influence' to use influence lines, 'direct' to solve the bridge for each position,
+            'exact' to only solve the critical train positions of each x. Defaults to 'influence'.
+        subdivisions (int, optional): how many x to solve at. Defaults to constants.SUBDIVISIONS.
+        vehicle (LoadModel, optional): axle layout of the train, its loads are scaled to train_weight. Defaults to load_model.get_train().
+        symmetry (bool, optional): False to always solve every x. Defaults to True.
+        cache (bool, optional): False to solve again instead of using envelopes kept by the bridge, i.e. for timing. Defaults to True.
+
+    Returns:
+        EnvelopeResult: the envelopes
+    """
+    if single_position != None:
+        positions = np.array((single_position,), dtype=float)
+    elif engine == 'exact':
+        positions = np.array((0, 240), dtype=float)  # the whole travel, the critical positions between are found
+    else:
+        positions = get_train_positions(movement_increment)
+
+    if engine not in ('exact', 'influence', 'direct'):
+        raise ValueError(f'unknown engine: {engine}')
+
+    if vehicle is None:
+        vehicle = load_model.get_train()
+    vehicle = vehicle.get_scaled(1)
+
+    key = (engine, subdivisions, Bridge.length, vehicle.offsets.tobytes(),
+           vehicle.loads.tobytes(), positions.tobytes(), symmetry)
+
+    return Bridge.get_cached_envelope(key, lambda: __solve_unit(Bridge, positions, engine, subdivisions, vehicle, symmetry), cache).get_scaled(train_weight)
+
+
+def __solve_unit(Bridge: object, positions: np.ndarray, engine: str, subdivisions: int, vehicle: object, symmetry: bool) -> EnvelopeResult:
+    """solve the envelopes of a train weighing 1, see solve
+
+    Returns:
+        EnvelopeResult: the envelopes
+    """
+    x = Bridge.get_sample_points(subdivisions)
+
+    mirrored = None
+    if symmetry and engine == 'influence':
+        mirrored = __solve_mirrored(Bridge, x, positions, vehicle)
+
+    if mirrored is not None:
+        shear_forces, shear_positions, bending_moments, bending_positions = mirrored
+    else:
+        if engine == 'exact':
+            shear_forces, shear_positions, bending_moments, bending_positions = solve_exact(
+                Bridge, x, 1, positions[0], positions[-1], vehicle)
+        elif engine == 'influence':
+            shear_forces, bending_moments = solve_influence(
+                Bridge, x, positions, 1, vehicle)
+            shear_positions = bending_positions = positions
+        else:
+            shear_forces, bending_moments = solve_direct(
+                Bridge, x, positions, 1, vehicle)
+            shear_positions = bending_positions = positions
+
+        shear_forces, shear_positions = get_envelope(
+            shear_forces, shear_positions)
+        bending_moments, bending_positions = get_envelope(
+            bending_moments, bending_positions)
+
+    arrays = (x, shear_forces, bending_moments,
+              shear_positions, bending_positions)
+    for array in arrays[1:]:
+        array.setflags(write=False)
+
+    return EnvelopeResult(*arrays, 1)
+
+
+def __solve_mirrored(Bridge: object, x: np.ndarray, positions: np.ndarray, vehicle: object) -> tuple:
+    """solve the envelopes from the left half of the x values, the train at a position causes the shear force at
+    length-x of the train at the mirrored position at x with the sign flipped, and the same bending moment
+
+    Args:
+        Bridge (object): Bridge object
+        x (np.ndarray): positions along the bridge, mirrored about the middle
+        positions (np.ndarray): left-most positions of the train
+        vehicle (LoadModel): axle layout of the train
+
+    Returns:
+        (np.ndarray, np.ndarray, np.ndarray, np.ndarray) | None: shear force envelope, shear force train positions,
+        bending moment envelope, bending moment train positions, None if the train or x are not symmetric or
+        there is no work saved
+    """
+    n = len(x)
+    half = (n+1)//2
+
+    if not vehicle.check_symmetric() or not np.allclose(x+x[::-1], Bridge.length, rtol=0, atol=constants.PRECISION):
+        return None
+
+    mirrored = Bridge.length-vehicle.length-positions
+
+    # solve each position once, the mirror of a position can be another position
+    keys = np.round(positions/constants.PRECISION).astype(np.int64).tolist()
+    mirrored_keys = np.round(
+        mirrored/constants.PRECISION).astype(np.int64).tolist()
+    union = {}
+    for key, position in zip(keys+mirrored_keys, positions.tolist()+mirrored.tolist()):
+        union.setdefault(key, position)
+
+    if len(union)*half >= len(positions)*n:
+        return None
+
+    index = {key: i for i, key in enumerate(union)}
+    rows = [index[key] for key in keys]
+    mirrored_rows = [index[key] for key in mirrored_keys]
+
+    shear_forces, bending_moments = solve_influence(
+        Bridge, x[:half], np.fromiter(union.values(), dtype=float), 1, vehicle)
+
+    envelopes = []
+    for forces, sign in ((shear_forces, -1), (bending_moments, 1)):
+        left = get_envelope(forces[rows], positions)
+        right = get_envelope(
+            sign*forces[mirrored_rows][:, :n-half][:, ::-1], positions)
+        envelopes += [np.concatenate((left[0], right[0])),
+                      np.concatenate((left[1], right[1]))]
+
+    return tuple(envelopes)
+
+
+def get_train_positions(movement_increment: float, start=0, stop=240) -> np.ndarray:
+    """get every position of the train when moving it from start to stop
+
+    Args:
+        movement_increment (number): how much to move the train, can be less than 1
+        start (number, optional): first left-most position of the train. Defaults to 0.
+        stop (number, optional): last left-most position of the train, included if reached. Defaults to 240.
+
+    Returns:
+        np.ndarray: train positions
+    """
+    steps = int(np.floor((stop-start)/movement_increment + 1e-9))
+
+    return start + np.arange(steps+1)*movement_increment
+
+
+def solve_influence(Bridge: object, x: Iterable, positions: Iterable, train_weight: float, vehicle=None) -> tuple:
+    """solve for the shear force and bending moment at every x for every train position using influence lines
+
+    Args:
+        Bridge (object): Bridge object
+        x (Iterable): positions along the bridge
+        positions (Iterable): left-most positions of the train
+        train_weight (number): weight of the train
+        vehicle (LoadModel, optional): axle layout of the train. Defaults to load_model.get_train().
+
+    Returns:
+        (np.ndarray, np.ndarray): shear forces, bending moments, shape (positions, x)
+    """
+    vehicle = __return_vehicle(vehicle, train_weight)
+    lines = influence.InfluenceLines(Bridge.length, x)
+
+    return lines.get_forces(positions, vehicle.offsets, vehicle.loads)
+
+
+def solve_direct(Bridge: object, x: Iterable, positions: Iterable, train_weight: float, vehicle=None) -> tuple:
+    """solve for the shear force and bending moment at every x for every train position by solving the bridge for each position
+
+    Args:
+        Bridge (object): Bridge object
+        x (Iterable): positions along the bridge
+        positions (Iterable): left-most positions of the train
+        train_weight (number): weight of the train
+        vehicle (LoadModel, optional): axle layout of the train. Defaults to load_model.get_train().
+
+    Returns:
+        (np.ndarray, np.ndarray): shear forces, bending moments, shape (positions, x)
+    """
+    vehicle = __return_vehicle(vehicle, train_weight)
+
+    shear_forces = np.empty((len(positions), len(x)))
+    bending_moments = np.empty((len(positions), len(x)))
+
+    for i, val in enumerate(positions):
+        Bridge.solve_shear_force(vehicle.offsets+val, vehicle.loads)
+
+        shear_forces[i] = Bridge.get_shear_forces(x)
+        bending_moments[i] = Bridge.get_bending_moments(x)
+
+    return shear_forces, bending_moments
+
+
+def solve_exact(Bridge: object, x: Iterable, train_weight: float, start=0, stop=240, vehicle=None) -> tuple:
+    """solve for the shear force and bending moment at every x for every critical train position
+
+    the forces at a given x are piecewise linear in the train position, so the maximums occur at the
+    start or stop position, when a wheel is at x, or when a wheel is over a support. Just before a wheel
+    reaches x the shear force jumps, that limit is also returned with the position of the wheel at x
+
+    Args:
+        Bridge (object): Bridge object
+        x (Iterable): positions along the bridge
+        train_weight (number): weight of the train
+        start (number, optional): first left-most position of the train. Defaults to 0.
+        stop (number, optional): last left-most position of the train. Defaults to 240.
+        vehicle (LoadModel, optional): axle layout of the train. Defaults to load_model.get_train().
+
+    Returns:
+        (np.ndarray, np.ndarray, np.ndarray, np.ndarray): shear forces, shear force train positions,
+        bending moments, bending moment train positions, shape (candidate positions, x)
+    """
+    vehicle = __return_vehicle(vehicle, train_weight)
+    offsets = vehicle.offsets
+    loads = vehicle.loads
+
+    x = np.asarray(x, dtype=float)
+    n = len(offsets)
+    wheels = np.arange(n)
+
+    at_x = x[:, np.newaxis] - offsets
+    reached = (at_x > start) & (at_x <= stop)
+    supports = np.broadcast_to(
+        np.concatenate((-offsets, Bridge.length-offsets)), (len(x), 2*n))
+
+    positions = np.concatenate((
+        np.full((len(x), 1), start, dtype=float),
+        np.full((len(x), 1), stop, dtype=float),
+        np.clip(at_x, start, stop),
+        np.clip(supports, start, stop)), axis=1)
+
+    a = positions[..., np.newaxis] + offsets
+    # place the wheel defining each reached position exactly at x, avoids round off deciding its side
+    a[:, 2+wheels, wheels] = np.where(reached, x[:, np.newaxis], a[:, 2+wheels, wheels])
+
+    on_span = (a >= 0) & (a <= Bridge.length)
+    P = np.where(on_span, loads, 0)
+    A = (P*(1 - a/Bridge.length)).sum(axis=2)
+
+    passed = x[:, np.newaxis, np.newaxis] - a
+
+    shear_forces = A - (P*(passed > 0)).sum(axis=2)
+    bending_moments = A*x[:, np.newaxis] - (P*np.maximum(passed, 0)).sum(axis=2)
+
+    # shear force just before the wheel reaches x
+    shear_limits = shear_forces.copy()
+    shear_limits[:, 2+wheels] -= np.where(reached, P[:, 2+wheels, wheels], 0)
+
+    return np.concatenate((shear_forces, shear_limits), axis=1).T, np.concatenate((positions, positions), axis=1).T, \
+        bending_moments.T, positions.T
+
+
+def get_envelope(forces: np.ndarray, positions: Iterable) -> tuple:
+    """return the force with the largest magnitude at each x and the train position it occurs at,
+    the minimum is kept if the magnitudes are equal
+
+    Args:
+        forces (np.ndarray): forces with shape (train positions, x)
+        positions (Iterable): train position of each row of forces, shape (train positions,) or (train positions, x)
+
+    Returns:
+        (np.ndarray, np.ndarray): envelope of the forces at each x, governing train position at each x
+    """
+    positions = np.asarray(positions, dtype=float)
+    if positions.ndim == 1:
+        positions = positions[:, np.newaxis]
+    positions = np.broadcast_to(positions, forces.shape)
+
+    max_i = forces.argmax(axis=0)[np.newaxis]
+    min_i = forces.argmin(axis=0)[np.newaxis]
+    max_forces = np.take_along_axis(forces, max_i, axis=0)[0]
+    min_forces = np.take_along_axis(forces, min_i, axis=0)[0]
+
+    use_max = np.abs(max_forces) > np.abs(min_forces)
+
+    return np.where(use_max, max_forces, min_forces), np.where(
+        use_max, np.take_along_axis(positions, max_i, axis=0)[0], np.take_along_axis(positions, min_i, axis=0)[0])
+
+
+def __return_vehicle(vehicle: object, train_weight: float) -> object:
+    """return the axle layout of the train scaled to its weight
+
+    Args:
+        vehicle (LoadModel | None): axle layout of the train, None for load_model.get_train()
+        train_weight (number): weight of the train
+
+    Returns:
+        LoadModel: load model weighing train_weight
+    """
+    if vehicle is None:
+        return load_model.get_train(train_weight)
+
+    return vehicle.get_scaled(train_weight)
@@ -1,14 +1,63 @@
-from typing import Iterable
+from typing import Iterable, NamedTuple
+import heapq
 import math
+from operator import itemgetter
+
+import numpy as np
 
 from matplotlib.path import Path
 from matplotlib.patches import PathPatch
 import matplotlib.pyplot as plt
 
-from math import isclose
+from src import constants
 from src import geometry_object as go
+from src import rect_array
+
+PRECISION = constants.PRECISION
+
+
+def snap(value: float, precision=PRECISION) -> int:
+    """snap a coordinate to the integer lattice with a spacing of precision, snapped coordinates are compared,
+    grouped and hashed exactly
+
+    Args:
+        value (number): coordinate
+        precision (number, optional): spacing of the lattice. Defaults to PRECISION.
+
+    Returns:
+        int: lattice coordinate
+    """
+    return round(value/precision)
+
+
+class Flange(NamedTuple):
+    """a thin plate buckling from flexural stress
+
+    Attributes:
+        b (float): width
+        t (float): thickness
+        y_top (float): y of the top of the plate
+        name (str): name of the geometry object
+        capacity (float): critical stress
+    """
+    b: float
+    t: float
+    y_top: float
+    name: str
+    capacity: float
+
 
-PRECISION = 0.001
+class ShearPlate(NamedTuple):
+    """a thin plate buckling from shear stress, k=5
+
+    Attributes:
+        h (float): height
+        t (float): thickness
+        name (str): name of the geometry object
+    """
+    h: float
+    t: float
+    name: str
 
 
 class GeometryCollection:
@@ -21,33 +70,188 @@ class GeometryCollection:
             name (str, optional): name of the collection
             ignore_thin_plates (bool, optional): True to disable thin plate identification, useful for diaphragms
             joint_override (list, optional): Specify joints that should be used for calculations
+
+        the section properties, joints and thin plates are found when first used and kept until geometry_objects is set again
         """
         self.PRECISION = PRECISION
-        self.geometry_objects = geometry_objects
         self.geometry_object_groups = geometry_object_groups
         self.name = name
         self.joint_override = joint_override
+        self.ignore_thin_plate = ignore_thin_plate
+        self.geometry_objects = geometry_objects
+
+    @property
+    def geometry_objects(self) -> list:
+        """the geometry objects, their joints and folds are found on first access"""
+        self.__find_topology()
+        return self.__geometry_objects
+
+    @geometry_objects.setter
+    def geometry_objects(self, geometry_objects: Iterable) -> None:
+        self.__geometry_objects = geometry_objects
+        self.__cache = {}
+
+        if any(geometry_object.join_id for geometry_object in geometry_objects):
+            self.__find_joined()
+
+    @property
+    def rect_array(self) -> object:
+        """RectArray of the geometry objects"""
+        return self.__return_cached('rect_array', lambda: rect_array.RectArray(self.__geometry_objects))
+
+    @property
+    def centroid(self) -> float:
+        return self.__return_cached('centroid', self.find_centroid)
+
+    @property
+    def I(self) -> float:
+        return self.__return_cached('I', lambda: self.rect_array.find_I(self.centroid))
 
-        self.__find_joints()
-        self.centroid = self.find_centroid()
-        self.I = self.find_I()
-        self.top = self.find_top()
-        self.bottom = self.find_bottom()
-        self.area = self.find_area()
+    @property
+    def top(self) -> float:
+        return self.__return_cached('top', self.find_top)
 
-        self.__find_joined()
-        self.__find_joints()
+    @property
+    def bottom(self) -> float:
+        return self.__return_cached('bottom', self.find_bottom)
 
-        if not ignore_thin_plate:
-            self.top_flange, self.side_flange, self.vertical_flange = self.find_thin_plates()
-            # self.top_crit, self.side_crit, self.vertical_crit = self.find_thin_plate_capacities(
-            #     self.find_thin_plates())
-            self.side_shear = self.find_thin_plate_shear()
-            # self.side_crit = self.find_thin_plate_shear_capacity(
-            #     self.find_thin_plate_shear())
+    @property
+    def area(self) -> float:
+        return self.__return_cached('area', self.find_area)
+
+    @property
+    def top_flange(self) -> list:
+        """k=4 data, see find_thin_plates"""
+        return self.__return_thin_plates()[0]
+
+    @property
+    def side_flange(self) -> list:
+        """k=0.425 data, see find_thin_plates"""
+        return self.__return_thin_plates()[1]
+
+    @property
+    def vertical_flange(self) -> list:
+        """k=6 data, see find_thin_plates"""
+        return self.__return_thin_plates()[2]
+
+    @property
+    def side_shear(self) -> list:
+        """k=5 data, see find_thin_plate_shear"""
+        return self.__return_thin_plates()[3]
+
+    def __return_cached(self, key: str, find: object) -> any:
+        """return a cached value, found and cached if missing
+
+        Args:
+            key (str): name of the value
+            find (Callable): returns the value
+
+        Returns:
+            any: the value
+        """
+        if key not in self.__cache:
+            self.__cache[key] = find()
+        return self.__cache[key]
+
+    def __return_thin_plates(self) -> tuple:
+        """return the thin plates, raises AttributeError if thin plate identification is disabled
+
+        Returns:
+            (list, list, list, list): k=4 data, k=0.425 data, k=6 data, k=5 data
+        """
+        if self.ignore_thin_plate:
+            raise AttributeError(
+                f'thin plate identification is disabled for {self.name}')
+
+        self.__find_topology()
+        return self.__cache['thin_plates']
+
+    def __find_topology(self) -> None:
+        """find the joints then the thin plates once, found again on the next access if either raises
+        """
+        if 'topology' in self.__cache:
+            return
+        self.__cache['topology'] = True  # finding the thin plates iterates over the collection
+
+        try:
+            if 'joints' not in self.__cache:
+                self.__find_joints()
+            if not self.ignore_thin_plate:
+                self.__cache['thin_plates'] = (
+                    *self.find_thin_plates(), self.find_thin_plate_shear())
+        except Exception:
+            del self.__cache['topology']
+            raise
+
+    def get_state(self) -> dict:
+        """get everything found for the collection, anything not found yet is found first, see set_state
+
+        Returns:
+            dict: section properties, joints, folds and joined of each geometry object and the thin plates
+        """
+        self.__find_topology()
+
+        return {'centroid': self.centroid, 'I': self.I, 'top': self.top, 'bottom': self.bottom, 'area': self.area,
+                'objects': [(geometry_object.joints, geometry_object.folds, geometry_object.joined)
+                            for geometry_object in self.__geometry_objects],
+                'thin_plates': self.__cache.get('thin_plates')}
+
+    def set_state(self, state: dict) -> None:
+        """use the state of a collection with the same geometry instead of finding it again
+
+        Args:
+            state (dict): state from get_state
+        """
+        if len(state['objects']) != len(self.__geometry_objects):
+            raise ValueError(
+                f'state has {len(state["objects"])} geometry objects, {self.name} has {len(self.__geometry_objects)}')
+
+        for geometry_object, (joints, folds, joined) in zip(self.__geometry_objects, state['objects']):
+            geometry_object.joints = joints
+            geometry_object.folds = folds
+            geometry_object.joined = joined
+
+        for key in ('centroid', 'I', 'top', 'bottom', 'area'):
+            self.__cache[key] = state[key]
+        if state['thin_plates'] is not None:
+            self.__cache['thin_plates'] = state['thin_plates']
+        self.__cache['topology'] = True
+
+    def get_joint_pairs(self) -> list:
+        """get the other geometry object of every joint and fold as they were found, before the thin plates sort them
+
+        Returns:
+            list | None: for each geometry object ([(other index, joint), ...], [(other index, fold), ...]),
+            None if the joints were not found by this collection
+        """
+        self.__find_topology()
+
+        return self.__cache.get('joint_pairs')
+
+    def set_joints(self, joints: list, folds: list) -> None:
+        """use joints and folds found elsewhere, i.e. by a SectionTemplate, instead of finding them,
+        must be called before the joints are first used
+
+        Args:
+            joints (list): joints of each geometry object
+            folds (list): folds of each geometry object
+        """
+        if 'topology' in self.__cache:
+            raise ValueError(f'the joints of {self.name} are already found')
+        if len(joints) != len(self.__geometry_objects) or len(folds) != len(self.__geometry_objects):
+            raise ValueError(
+                f'{self.name} has {len(self.__geometry_objects)} geometry objects')
+
+        for geometry_object, object_joints, object_folds in zip(self.__geometry_objects, joints, folds):
+            for joint in object_joints+object_folds:
+                self.__sort_joint(joint)
+            geometry_object.joints = object_joints
+            geometry_object.folds = object_folds
+
+        self.__cache['joints'] = True
 
     def find_area(self) -> float:
-        return sum([x.area for x in self])
+        return self.rect_array.find_area()
 
     def find_centroid(self) -> float:
         """find the centroid for the collective relative to y = 0, assumes the centroid is horizontal
@@ -55,13 +259,7 @@ class GeometryCollection:
         Returns:
             number: centroid relative to y = 0
         """
-        cen = 0
-        sum_of_areas = 0
-        for geometry_object in self.geometry_objects:
-            cen += geometry_object.find_centroid()*geometry_object.area
-            sum_of_areas += geometry_object.area
-
-        return cen/sum_of_areas
+        return self.rect_array.find_centroid()
 
     def find_I(self) -> float:
         """find the I for the collection, assumes the axis is a horizontal line
@@ -69,42 +267,31 @@ class GeometryCollection:
         Returns:
             number: I
         """
-        I = 0
-        cen = self.find_centroid()
-        for geometry_object in self.geometry_objects:
-            I += geometry_object.find_I()
-            I += geometry_object.area * \
-                (cen - geometry_object.find_centroid())**2
-
-        return I
+        return self.rect_array.find_I()
 
     def find_Q(self, y: float) -> float:
         """find the Q of the collection at a given y, assume the axis line is a horizontal line
 
         Args:
-            y (float): _description_
-
-        Returns:
-            number: Q
-        """
-        Q = 0
-        if y <= self.centroid:  # below centroid
-            for geometry_object in self:
-                # print(geometry_object.name)
-                new_cen = geometry_object.find_centroid_below(y)
-                # print(new_cen)
-                if new_cen:
-                    Q += geometry_object.find_area_below(y) * \
-                        abs(self.centroid - new_cen)
-        else:  # above centroid
-            for geometry_object in self:
-                # print(geometry_object.name)
-                new_cen = geometry_object.find_centroid_above(y)
-                # print(new_cen)
-                if new_cen:
-                    Q += geometry_object.find_area_above(y) * \
-                        abs(self.centroid - new_cen)
-        return Q
+            y (float | np.ndarray): height(s) to find Q at
+
+        Returns:
+            number | np.ndarray: Q
+        """
+        breaks, widths, areas, moments = self.rect_array.get_profiles()
+
+        y_array = np.clip(np.asarray(y, dtype=float), breaks[0], breaks[-1])
+        i = np.clip(np.searchsorted(breaks, y_array, side='right') -
+                    1, 0, len(widths)-1)
+
+        # area and first moment of area about y = 0 below y
+        A = areas[i] + widths[i]*(y_array-breaks[i])
+        S = moments[i] + widths[i]*(y_array**2-breaks[i]**2)/2
+
+        Q = np.where(y_array <= self.centroid, self.centroid*A - S,
+                     (moments[-1]-S) - self.centroid*(areas[-1]-A))
+
+        return float(Q) if Q.ndim == 0 else Q
 
     def find_top(self) -> float:
         """find the top of the collection
@@ -112,11 +299,7 @@ class GeometryCollection:
         Returns:
             number: the y value of the top
         """
-        top = self.centroid
-        for geometry_object in self:
-            if geometry_object.y > top:
-                top = geometry_object.y
-        return top
+        return self.rect_array.find_top(self.centroid)
 
     def find_bottom(self) -> float:
         """find the bottom of the collection
@@ -124,11 +307,7 @@ class GeometryCollection:
         Returns:
             number: the y value of the bottom
         """
-        bottom = self.centroid
-        for geometry_object in self:
-            if geometry_object.y-geometry_object.y_length < bottom:
-                bottom = geometry_object.y-geometry_object.y_length
-        return bottom
+        return self.rect_array.find_bottom(self.centroid)
 
     def get_joint_width(self, joint_list: Iterable) -> float:
         """get the width of a list of joints
@@ -162,33 +341,13 @@ class GeometryCollection:
         if self.joint_override:
             joint_heights = self.joint_override
 
-        sorted = [[]]
-        sorted[0].append(joint_heights[0])
+        # joints grouped by their snapped height, a joint is only kept once in a group
+        groups = {}
         for joint in joint_heights:
-            # if not self.__check_joint_horizontal(joint):
-            #     continue
-            placed = False
-            for group in sorted:
-                # if len(group) == 0:
-                #     group.append(joint)
-                #     placed = True
-                #     break
-                # else:
-                if self.__close(joint[0][1], group[0][0][1]):
-                    same = False
-                    for group_member in group:
-                        if self.__check_same_joint(joint, group_member):
-                            placed = True
-                            same = True
-
-                    if not same:
-                        group.append(joint)
-                        placed = True
-                        break
-            if not placed:
-                sorted.append([joint])
-
-        return sorted
+            group = groups.setdefault(self.__snap(joint[0][1]), {})
+            group.setdefault(self.__return_joint_key(joint), joint)
+
+        return [list(group.values()) for group in groups.values()]
 
     def __check_joint_horizontal(self, joint: Iterable) -> bool:
         """checks if a joint is collinear with the x axis
@@ -201,6 +360,15 @@ class GeometryCollection:
         """
         return abs(joint[0][0] - joint[1][0]) > abs(joint[0][1] - joint[1][1])
 
+    def __sort_joint(self, joint: list) -> None:
+        """sort the ends of a joint in place, left to right if it is horizontal, bottom to top if it is vertical
+
+        Args:
+            joint (list): joint
+        """
+        joint.sort(key=itemgetter(
+            0 if self.__check_joint_horizontal(joint) else 1))
+
     def __check_same_joint(self, joint1: Iterable, joint2: Iterable) -> bool:
         """check if two joints are the same
 
@@ -211,159 +379,213 @@ class GeometryCollection:
         Returns:
             bool: True if matching
         """
-        return self.__close(joint1[0][0], joint2[0][0]) and self.__close(joint1[1][0], joint2[1][0])
+        return self.__return_joint_key(joint1) == self.__return_joint_key(joint2)
+
+    def __return_joint_key(self, joint: Iterable) -> tuple:
+        """return the snapped x of the ends of a joint, joints with the same key are the same
+
+        Args:
+            joint (Iterable): joint
+
+        Returns:
+            tuple: (x1, x2) on the PRECISION lattice
+        """
+        return self.__snap(joint[0][0]), self.__snap(joint[1][0])
 
     def __close(self, x: float, y: float) -> bool:
-        """wrapper for math.isclose with the PRECISION value
+        """check if two numbers snap to the same PRECISION lattice point
 
         Args:
             x (number): number to compare
             y (number): number to compare
 
         Returns:
-            bool: True if isclose()
+            bool: True if the same
+        """
+        return self.__snap(x) == self.__snap(y)
+
+    def __snap(self, value: float) -> int:
+        return snap(value, self.PRECISION)
+
+    def __return_lattice_vertices(self, vertices: Iterable) -> tuple:
+        """return vertices snapped to the PRECISION lattice
+
+        Args:
+            vertices (Iterable): vertices
+
+        Returns:
+            tuple: ((x1, y1), ...) on the lattice
         """
-        return isclose(x, y, abs_tol=self.PRECISION)
+        return tuple((self.__snap(vertex[0]), self.__snap(vertex[1])) for vertex in vertices)
 
     def find_width(self, y: float) -> float:
-        """finds the width of the collection at y, kinda hacky
+        """finds the width of the collection just below y
 
         Args:
-            y (number): height to find width at
+            y (number | np.ndarray): height(s) to find width at
 
         Returns:
-            number: width
+            number | np.ndarray: width
         """
-        dy = 0.0001
+        breaks, widths, areas, moments = self.rect_array.get_profiles()
 
-        A1 = 0
-        A2 = 0
+        i = np.searchsorted(breaks, y, side='left') - 1
+        inside = (i >= 0) & (i < len(widths))
 
-        for geometry_object in self:
-            A1 += geometry_object.find_area_below(y)
-            A2 += geometry_object.find_area_below(y-dy)
+        b = np.where(inside, widths[np.clip(i, 0, len(widths)-1)], 0.0)
 
-        return (A1 - A2) / dy
+        return float(b) if b.ndim == 0 else b
 
     def __find_joined(self) -> None:
-        """find and set the joined geometry objects in the collection
+        """find and set the joined geometry objects in the collection, every group of objects with the same join_id
+        is replaced by one rect, the joined rects follow the other objects in the order their groups first appear
+
+        the joints between the stacked objects of a group are kept in Rect.joined
         """
-        for i, geometry_object in enumerate(self.geometry_objects):
+        groups = {}
+        geometry_objects = []
+
+        for geometry_object in self.__geometry_objects:
             if geometry_object.join_id:
-                to_join = []
-                for j, geo in enumerate(self.geometry_objects):
-                    if geo.join_id == geometry_object.join_id:
-                        to_join.append(j)
-
-                x = 0
-                x_length = self.geometry_objects[to_join[0]].x_length
-                y = 0
-                y_length = 0
-                joints = []
-
-                for x in to_join:
-                    if self.geometry_objects[x].x < x:
-                        x = self.geometry_objects[x].x
-                    if self.geometry_objects[x].y > y:
-                        y = self.geometry_objects[x].y
-                    for joint in self.geometry_objects[x].joints:
-                        contained = False
-                        for j in joints:
-                            if not self.__check_same_joint(joint, j):
-                                contained = True
-                        if not contained:
-                            joints.append(joint)
-                    y_length += self.geometry_objects[x].y_length
-
-                name = self.geometry_objects[to_join[0]].name
-                tags = self.geometry_objects[to_join[0]].tags.get_tags_str()
-
-                new_rect = go.Rect(x, y, x_length, y_length,
-                                   name=name, tags=tags)
-                new_rect.joined = joints
-
-                self.geometry_objects = [v for i, v in enumerate(
-                    self.geometry_objects) if i not in frozenset(to_join)]
-                self.geometry_objects.append(new_rect)
-                self.__find_joined()
-                return
+                groups.setdefault(geometry_object.join_id,
+                                  []).append(geometry_object)
+            else:
+                geometry_objects.append(geometry_object)
+
+        for group in groups.values():
+            stacked = sorted(group, key=lambda geo: -geo.y)
+
+            joints = []
+            for upper, lower in zip(stacked, stacked[1:]):
+                joint = self.__find_collinear_side(
+                    upper.get_vertices(), lower.get_vertices())
+                if joint:
+                    joints.append(joint)
+
+            new_rect = go.Rect(min(geo.x for geo in group), stacked[0].y, group[0].x_length,
+                               sum(geo.y_length for geo in group), name=group[0].name, tags=group[0].tags.get_tags_str())
+            new_rect.joined = joints
+
+            geometry_objects.append(new_rect)
+
+        self.__geometry_objects = geometry_objects
 
     def __find_joints(self) -> None:
         """Find the joints of all geometry objects, automatically assigns the joints to each object
+
+        only pairs of objects sharing an edge line are checked, see __find_touching
         """
-        for i, geometry_object in enumerate(self.geometry_objects):
-            vertices = geometry_object.get_vertices()
+        touching = self.__find_touching()
+        pairs = []
+
+        vertices = [geometry_object.get_vertices()
+                    for geometry_object in self.__geometry_objects]
+        lattice = [self.__return_lattice_vertices(
+            vertex) for vertex in vertices]
+
+        for i, geometry_object in enumerate(self.__geometry_objects):
             joints = []
             folds = []
+            joint_pairs = []
+            fold_pairs = []
 
-            for other_object in self.geometry_objects[:i]+self.geometry_objects[i+1:]:
+            for j in sorted(touching[i]):
+                other_object = self.__geometry_objects[j]
 
                 joint = self.__find_collinear_side(
-                    vertices, other_object.get_vertices())
+                    vertices[i], vertices[j], lattice[i], lattice[j])
                 same_group = False
                 for group in self.geometry_object_groups:
                     if geometry_object.id in group and other_object.id in group:
                         same_group = True
                 if joint:
+                    self.__sort_joint(joint)
                     if same_group:
                         folds.append(joint)
+                        fold_pairs.append((j, tuple(joint)))
                     else:
                         joints.append(joint)
+                        joint_pairs.append((j, tuple(joint)))
 
             geometry_object.joints = joints
             geometry_object.folds = folds
+            pairs.append((joint_pairs, fold_pairs))
 
-    def __find_collinear_side(self, vertices_1: Iterable, vertices_2: Iterable) -> tuple:
-        """return the collinear side of two boxes, None if no collinear side exists
+        self.__cache['joints'] = True
+        self.__cache['joint_pairs'] = pairs
 
-        Args:
-            vertices_1 (iterable): vertices
-            vertices_2 (iterable): vertices
+    def __find_touching(self) -> list:
+        """find the pairs of objects that can share a joint, a joint needs a vertex of one object on a side of the other,
+        so both objects have a side on the same line of the PRECISION lattice and the sides overlap
+
+        the sides are bucketed by their snapped line, each bucket is swept in order of the start of the sides,
+        keeping the sides that have not ended yet
 
         Returns:
-            tuple: ((x1, y1), (x2, y2)), coordinates defining joint 
+            list: set of the indices of the objects touching each object, by index
         """
-        bounds = self.__get_bounds(vertices_1)
-        collinear_side = []
+        vertical = {}
+        horizontal = {}
+
+        rects = self.rect_array
+        left, right, bottom, top = (np.round(side/self.PRECISION).astype(np.int64).tolist() for side in (
+            np.minimum(rects.x, rects.right), np.maximum(rects.x, rects.right),
+            np.minimum(rects.bottom, rects.y), np.maximum(rects.bottom, rects.y)))
+
+        for i in range(len(rects)):
+            for line in {left[i], right[i]}:
+                vertical.setdefault(line, []).append((bottom[i], top[i], i))
+            for line in {bottom[i], top[i]}:
+                horizontal.setdefault(line, []).append((left[i], right[i], i))
+
+        touching = [set() for _ in self.__geometry_objects]
+
+        for buckets in (vertical, horizontal):
+            for sides in buckets.values():
+                active = []
+
+                for start, end, i in sorted(sides):
+                    while active and active[0][0] < start:
+                        heapq.heappop(active)
 
-        for vertex in vertices_2:
-            for bound in bounds:
-                bounded_x = vertex[0] < bound[0][0] and vertex[0] > bound[1][0]
-                aligned_x = isclose(vertex[0], bound[0][0], abs_tol=self.PRECISION) or isclose(
-                    vertex[0], bound[1][0], abs_tol=self.PRECISION)
+                    for _, j in active:
+                        if i != j:
+                            touching[i].add(j)
+                            touching[j].add(i)
 
-                if bounded_x or aligned_x:
-                    bounded_y = vertex[1] < bound[0][1] and vertex[1] > bound[1][1]
-                    aligned_y = isclose(vertex[1], bound[0][1], abs_tol=self.PRECISION) or isclose(
-                        vertex[1], bound[1][1], abs_tol=self.PRECISION)
+                    heapq.heappush(active, (end, i))
 
-                    if bounded_y or aligned_y:
-                        collinear_side.append(vertex)
+        return touching
 
-        collinear_side = list(set(collinear_side))  # hacky solution
-        if len(collinear_side) == 2:
-            return collinear_side
+    def __find_collinear_side(self, vertices_1: Iterable, vertices_2: Iterable, lattice_1=None, lattice_2=None) -> tuple:
+        """return the collinear side of two boxes, None if no collinear side exists
 
-        bounds = self.__get_bounds(vertices_2)
-        collinear_side = []
+        Args:
+            vertices_1 (iterable): vertices
+            vertices_2 (iterable): vertices
+            lattice_1 (iterable, optional): vertices_1 on the PRECISION lattice if already snapped
+            lattice_2 (iterable, optional): vertices_2 on the PRECISION lattice if already snapped
 
-        for vertex in vertices_1:
-            for bound in bounds:
-                bounded_x = vertex[0] < bound[0][0] and vertex[0] > bound[1][0]
-                aligned_x = isclose(vertex[0], bound[0][0], abs_tol=self.PRECISION) or isclose(
-                    vertex[0], bound[1][0], abs_tol=self.PRECISION)
+        Returns:
+            tuple: ((x1, y1), (x2, y2)), coordinates defining joint 
+        """
+        if lattice_1 is None:
+            lattice_1 = self.__return_lattice_vertices(vertices_1)
+        if lattice_2 is None:
+            lattice_2 = self.__return_lattice_vertices(vertices_2)
 
-                if bounded_x or aligned_x:
-                    bounded_y = vertex[1] < bound[0][1] and vertex[1] > bound[1][1]
-                    aligned_y = isclose(vertex[1], bound[0][1], abs_tol=self.PRECISION) or isclose(
-                        vertex[1], bound[1][1], abs_tol=self.PRECISION)
+        for vertices, lattice, other_lattice in ((vertices_2, lattice_2, lattice_1), (vertices_1, lattice_1, lattice_2)):
+            bounds = self.__get_bounds(other_lattice)
+            collinear_side = {}  # lattice point: first vertex on it
 
-                    if bounded_y or aligned_y:
-                        collinear_side.append(vertex)
+            for vertex, point in zip(vertices, lattice):
+                for bound in bounds:
+                    # the first end of a bound is never left of or below the second
+                    if bound[1][0] <= point[0] <= bound[0][0] and bound[1][1] <= point[1] <= bound[0][1]:
+                        collinear_side.setdefault(point, vertex)
 
-        collinear_side = list(set(collinear_side))
-        if len(collinear_side) == 2:
-            return collinear_side
+            if len(collinear_side) == 2:
+                return list(collinear_side.values())
 
     def __get_bounds(self, vertices: Iterable) -> tuple:
         """generate the bounds of all sides of the box
@@ -436,19 +658,15 @@ class GeometryCollection:
         return (5*math.pi**2*4000)/(12*(1-0.2**2)) * \
             ((thin_plate[1]/thin_plate[0])**2+(thin_plate[1]/a)**2)
 
-    def find_thin_plates(self) -> list:
-        """find the thin plates in the collection
+    def find_thin_plates(self) -> tuple:
+        """find the thin plates in the collection, the joints are not changed
 
         Returns:
-            (list, list, list): k=4 data, k=0.425 data, k=6 data
+            (tuple, tuple, tuple): Flange of each k=4, k=0.425 and k=6 plate
         """
-        top_flange = []  # [(b, t, y_top, name), (b, t, y_top, name)]
-        side_flange = []  # [(b, t, y_top, name), (b, t, y_top, name)]
-        vertical_flange = []  # [(b, t, y_top, name), (b, t, y_top, name)]
-
-        # group folded joints - done
-
-        # left to right
+        top_flange = []
+        side_flange = []
+        vertical_flange = []
 
         # if horizontal rect and above centroid
         # get bounds of rect until it reaches a joint,
@@ -458,116 +676,102 @@ class GeometryCollection:
 
         for geometry_object in self:
             if geometry_object.horizontal and geometry_object.y > self.centroid and geometry_object.name != '!exclude':
-                exclude = False
                 # exclude all rects with a joint that spans their length
-                for joint in geometry_object.joints:
-                    if self.__close(self.get_joint_width((joint,)), geometry_object.x_length):
-                        exclude = True
-                if not exclude:
-                    candidates.append(geometry_object)
-                else:
+                if any(self.__close(self.get_joint_width((joint,)), geometry_object.x_length) for joint in geometry_object.joints):
                     exclusion.append(geometry_object)
+                else:
+                    candidates.append(geometry_object)
 
-        # print([v.name for v in candidates])
+        excluded = self.__return_joint_index(
+            [joint for ex in exclusion for joint in ex.joints])
 
         for candidate in candidates:
-            bounds = []
-            for joint in candidate.joints:
-                exclude = False
-                for ex in exclusion:
-                    for j in ex.joints:
-                        if self.__check_same_joint(joint, j):
-                            exclude = True
-                if not exclude:
-                    bounds.append(joint)
-            for bound in bounds:
-                bound.sort(key=lambda tup: tup[0])
-            bounds.sort(key=lambda tup: tup[0][0])
-            side_flange.append(
-                [bounds[0][0][0] - candidate.x + (bounds[0][1][0] - bounds[0][0][0])/2, candidate.y_length, candidate.y, candidate.name])
-            side_flange.append([(candidate.x+candidate.x_length) -
-                                bounds[-1][1][0]+(bounds[-1][1][0] - bounds[-1][0][0])/2, candidate.y_length, candidate.y, candidate.name])
-            for i, bound in list(enumerate(bounds))[:-1]:
-                if candidate.special_id != 'no top':
-                    top_flange.append(
-                        [bounds[i+1][0][0]-bound[0][0]-(bound[1][0] - bound[0][0])/2+(bounds[i+1][1][0]-bounds[i+1][0][0])/2, candidate.y_length, candidate.y, candidate.name])
+            bounds = sorted((joint for joint in candidate.joints if not self.__check_indexed_joint(excluded, joint)),
+                            key=lambda joint: joint[0][0])
 
-        candidates = []
+            for b in (bounds[0][0][0] - candidate.x + (bounds[0][1][0] - bounds[0][0][0])/2,
+                      (candidate.x+candidate.x_length) - bounds[-1][1][0]+(bounds[-1][1][0] - bounds[-1][0][0])/2):
+                side_flange.append(Flange(b, candidate.y_length, candidate.y, candidate.name,
+                                          self.find_side_capacities((b, candidate.y_length))))
 
-        for geometry_object in self:
-            if geometry_object.vertical and geometry_object.y > self.centroid:
-                candidates.append(geometry_object)
+            if candidate.special_id != 'no top':
+                for bound, next_bound in zip(bounds, bounds[1:]):
+                    b = next_bound[0][0]-bound[0][0] - \
+                        (bound[1][0] - bound[0][0])/2+(next_bound[1][0]-next_bound[0][0])/2
+                    top_flange.append(Flange(b, candidate.y_length, candidate.y, candidate.name,
+                                             self.find_top_capacities((b, candidate.y_length))))
 
-        # print([v.name for v in candidates])
-        # print([i.name for i in self])
+        for candidate in self.__return_vertical_candidates():
+            bounds = self.__return_vertical_bounds(candidate)
 
-        for candidate in candidates:
-            # print(candidate.x)
-            bounds = []
-            for joint in candidate.folds:
-                if not self.__check_joint_horizontal(joint):
-                    bounds.append(joint)
-            for joint in candidate.joints:
-                if not self.__check_joint_horizontal(joint):
-                    bounds.append(joint)
-            for bound in bounds:
-                bound.sort(key=lambda tup: tup[1])
-            bounds.sort(key=lambda tup: tup[0][1])
-            # print(bounds)
+            b = candidate.y - self.centroid - \
+                (bounds[0][1][1]-bounds[0][0][1])/2
+            vertical_flange.append(Flange(b, candidate.x_length, candidate.y, candidate.name,
+                                          self.find_vertical_capacities((b, candidate.x_length))))
 
-            vertical_flange.append(
-                [candidate.y - self.centroid - (bounds[0][1][1]-bounds[0][0][1])/2, candidate.x_length, candidate.y, candidate.name])
+        return tuple(top_flange), tuple(side_flange), tuple(vertical_flange)
 
-        # top_flange = []  # [(b, t, y_top, name, cap), (b, t, y_top, name, cap)]
-        # side_flange = []  # [(b, t, y_top, name, cap), (b, t, y_top, name, cap)]
-        # vertical_flange = []  # [(b, t, y_top, name, cap), (b, t, y_top, name, cap)]
+    def find_thin_plate_shear(self) -> tuple:
+        """return the thin plates k=5 in the collection, the joints are not changed
 
-        for flange in top_flange:
-            flange.append(self.find_top_capacities(flange))
-        for flange in side_flange:
-            flange.append(self.find_side_capacities(flange))
-        for flange in vertical_flange:
-            flange.append(self.find_vertical_capacities(flange))
+        Returns:
+            tuple: ShearPlate of each k=5 plate
+        """
+        shear_plates = []
 
-        return top_flange, side_flange, vertical_flange
+        for candidate in self.__return_vertical_candidates():
+            bounds = self.__return_vertical_bounds(candidate)
+
+            h = candidate.y - (bounds[0][1][1]-bounds[0][0][1])/2
+            if len(bounds) >= 2:
+                h -= (bounds[-1][1][1]-bounds[-1][0][1])/2
+            shear_plates.append(
+                ShearPlate(h, candidate.x_length, candidate.name))
 
-    def find_thin_plate_shear(self) -> list:
-        """return the thin plates k=5 in the collection
+        return tuple(shear_plates)
+
+    def __return_vertical_candidates(self) -> list:
+        """return the vertical geometry objects above the centroid
 
         Returns:
-            list: k=5 data
+            list: geometry objects
         """
+        return [geometry_object for geometry_object in self if geometry_object.vertical and geometry_object.y > self.centroid]
 
-        shear_plates = []  # h w name
+    def __return_vertical_bounds(self, candidate: object) -> list:
+        """return the vertical folds then joints of a geometry object, bottom to top
 
-        candidates = []
+        Args:
+            candidate (object): geometry object
 
-        for geometry_object in self:
-            if geometry_object.vertical and geometry_object.y > self.centroid:
-                candidates.append(geometry_object)
+        Returns:
+            list: folds and joints
+        """
+        return sorted((joint for joint in candidate.folds+candidate.joints if not self.__check_joint_horizontal(joint)),
+                      key=lambda joint: joint[0][1])
 
-        for candidate in candidates:
-            # print(candidate.x)
-            bounds = []
-            for joint in candidate.folds:
-                if not self.__check_joint_horizontal(joint):
-                    bounds.append(joint)
-            for joint in candidate.joints:
-                if not self.__check_joint_horizontal(joint):
-                    bounds.append(joint)
-            for bound in bounds:
-                bound.sort(key=lambda tup: tup[1])
-            bounds.sort(key=lambda tup: tup[0][1])
-            # print(bounds)
+    def __return_joint_index(self, joints: Iterable) -> set:
+        """index joints by the x of their ends snapped to the PRECISION lattice
 
-            if len(bounds) >= 2:
-                shear_plates.append(
-                    [candidate.y - (bounds[0][1][1]-bounds[0][0][1])/2 - (bounds[-1][1][1]-bounds[-1][0][1])/2, candidate.x_length, candidate.name])
-            else:
-                shear_plates.append(
-                    [candidate.y - (bounds[0][1][1]-bounds[0][0][1])/2, candidate.x_length, candidate.name])
+        Args:
+            joints (Iterable): joints
 
-        return shear_plates
+        Returns:
+            set: {(x1, x2), ...} key of each joint, see __return_joint_key
+        """
+        return {self.__return_joint_key(joint) for joint in joints}
+
+    def __check_indexed_joint(self, index: set, joint: Iterable) -> bool:
+        """check if the same joint is in an index, see __check_same_joint
+
+        Args:
+            index (set): index from __return_joint_index
+            joint (Iterable): joint
+
+        Returns:
+            bool: True if found
+        """
+        return self.__return_joint_key(joint) in index
 
     def display_geometry(self, bounding=(120, 100), window_size=(6, 6), show_joints=True, show_data=True) -> None:
         """display the geometry collection visually
@@ -639,10 +843,10 @@ class GeometryCollection:
                 ax.add_patch(join_pathpatch)
 
         if show_data:
-            ax.hlines(self.find_centroid(), 0,
+            ax.hlines(self.centroid, 0,
                       bounding[0], color='blue', alpha=0.6, label='centroid')
 
-            str = f'I: {self.find_I():.3f}\ncentroid: {self.find_centroid():.3f}'
+            str = f'I: {self.I:.3f}\ncentroid: {self.centroid:.3f}'
             ax.text(bounding[0]-30, bounding[1]+1, str)
 
         ax.set_title('Cross section')
@@ -690,6 +894,7 @@ class GeometryCollection:
         return v
 
     def __iter__(self):
+        self.__find_topology()
         self.n = 0
         return self
 
@@ -1,4 +1,10 @@
+from functools import lru_cache
+
+
 class Rect():
+    __slots__ = ('x', 'y', 'x_length', 'y_length', 'area', 'tags', 'id', 'name', 'join_id', 'special_id',
+                 'horizontal', 'vertical', 'joints', 'folds', 'joined')
+
     def __init__(self, x: float, y: float, x_length: float, y_length: float, tags=None, id=None, name=None, join_id=None, special_id=None) -> None:
         """create a geometry object, up is positive and right is positive
 
@@ -18,16 +24,15 @@ class Rect():
         self.x_length = x_length
         self.y_length = y_length
         self.area = x_length*y_length
-        self.tags = TagHandler(tags, 'display:True joint-display:True')
+        self.tags = get_tag_handler(tags, 'display:True joint-display:True')
 
         self.id = id
         self.name = name
         self.join_id = join_id
         self.special_id = special_id
 
-        self.horizontal = False
-        self.vertical = False
-        self.__find_horizontal_or_vertical()
+        self.horizontal = x_length > y_length
+        self.vertical = x_length < y_length  # its a square if neither
 
         self.joints = None
         self.folds = None
@@ -95,8 +100,7 @@ class Rect():
         """
         if y > self.y-self.y_length and y < self.y:  # if between rectangle
             new_length = self.y-y
-            # print(new_y, new_length)
-            return y-new_length+(new_length/2)
+            return y+(new_length/2)
         if y >= self.y:  # if above rectangle
             return None
         if y <= self.y-self.y_length:  # if below rectangle
@@ -138,18 +142,10 @@ class Rect():
         """
         return self.tags.get_tag(tag)
 
-    def __find_horizontal_or_vertical(self):
-        """find and set if the rect is horizontal or vertical
-        """
-        if self.x_length > self.y_length:
-            self.horizontal = True
-        elif self.x_length < self.y_length:
-            self.vertical = True
-
-        # its a square if both this conditions pass
-
 
 class TagHandler():
+    __slots__ = ('input_tags', 'tags')
+
     def __init__(self, tags: str, defaults: str) -> None:
         """create a tag handler object, booleans and ints have their value casted
 
@@ -199,3 +195,17 @@ class TagHandler():
                 self.tags[args[0]] = int(args[1])
             else:
                 self.tags[args[0]] = args[1]
+
+
+@lru_cache(maxsize=1024)
+def get_tag_handler(tags: str, defaults: str) -> TagHandler:
+    """get a tag handler, one is shared by every caller with the same tags so it must not be changed
+
+    Args:
+        tags (str): tags
+        defaults (str): default tags
+
+    Returns:
+        TagHandler: the tag handler
+    """
+    return TagHandler(tags, defaults)
@@ -0,0 +1,125 @@
+from typing import Iterable
+
+import numpy as np
+
+CHUNK_SIZE = 2**22  # max number of influence line values held in memory at once
+
+
+class InfluenceLines:
+    def __init__(self, length: float, x: Iterable) -> None:
+        """create the shear force and bending moment influence lines of a simply supported span A---------B
+
+        Assumptions:
+        - A load placed exactly at x acts to the right of x, matching Bridge.get_shear_force
+        - A load outside of the span is carried directly by the supports
+
+        Args:
+            length (number): length of the span in millimeters
+            x (Iterable): positions along the span the influence lines are evaluated at
+        """
+        self.length = length
+        self.x = np.asarray(x, dtype=float)
+
+    def get_shear_forces(self, load_positions: Iterable) -> np.ndarray:
+        """get the shear force at every x caused by a unit load at each load position
+
+        Args:
+            load_positions (Iterable): positions of the unit load
+
+        Returns:
+            np.ndarray: shear forces, shape (*load_positions, x)
+        """
+        a = np.asarray(load_positions, dtype=float)[..., np.newaxis]
+
+        shear_forces = (1 - a/self.length) - (a < self.x)
+
+        return np.where(self.__return_on_span(a), shear_forces, 0)
+
+    def get_bending_moments(self, load_positions: Iterable) -> np.ndarray:
+        """get the bending moment at every x caused by a unit load at each load position
+
+        Args:
+            load_positions (Iterable): positions of the unit load
+
+        Returns:
+            np.ndarray: bending moments, shape (*load_positions, x)
+        """
+        a = np.asarray(load_positions, dtype=float)[..., np.newaxis]
+
+        bending_moments = np.where(
+            a < self.x, a*(self.length-self.x), self.x*(self.length-a))/self.length
+
+        return np.where(self.__return_on_span(a), bending_moments, 0)
+
+    def get_forces(self, positions: Iterable, offsets: Iterable, loads: Iterable) -> tuple:
+        """get the shear force and bending moment at every x for a group of point loads placed at every position
+
+        Args:
+            positions (Iterable): positions of the group of loads, i.e. left-most position of a train
+            offsets (Iterable): position of each load relative to the position of the group
+            loads (Iterable): force of each point load, index should match offsets
+
+        Returns:
+            (np.ndarray, np.ndarray): shear forces, bending moments, shape (positions, x)
+        """
+        positions = np.asarray(positions, dtype=float).reshape(-1)
+        offsets = np.asarray(offsets, dtype=float)
+
+        return self.get_load_case_forces(positions[:, np.newaxis] + offsets, loads)
+
+    def get_load_case_forces(self, load_positions: Iterable, loads: Iterable) -> tuple:
+        """get the shear force and bending moment at every x for a batch of load cases, each a set of point loads
+
+        the influence lines are split into the reaction at A and the step/ramp of each load passing x,
+        the step and ramp matrices of each chunk of load cases are contracted against the loads in one product
+
+        Args:
+            load_positions (Iterable): positions of the point loads, shape (load cases, point loads)
+            loads (Iterable): force of each point load, shape (load cases, point loads) or (point loads,)
+
+        Returns:
+            (np.ndarray, np.ndarray): shear forces, bending moments, shape (load cases, x)
+        """
+        load_positions = np.asarray(load_positions, dtype=float)
+        load_positions = load_positions.reshape(-1, load_positions.shape[-1])
+        loads = np.broadcast_to(np.asarray(loads, dtype=float), load_positions.shape)
+
+        shear_forces = np.empty((len(load_positions), len(self.x)))
+        bending_moments = np.empty((len(load_positions), len(self.x)))
+
+        step = max(1, CHUNK_SIZE//max(1, load_positions.shape[1]*len(self.x)))
+
+        for i in range(0, len(load_positions), step):
+            a = load_positions[i:i+step]
+            P = np.where(self.__return_on_span(a), loads[i:i+step], 0)[:, np.newaxis, :]
+            A = (P*(1 - a/self.length)[:, np.newaxis, :]).sum(axis=2)
+
+            passed = self.x - a[..., np.newaxis]
+
+            shear_forces[i:i+step] = A - (P @ (passed > 0))[:, 0]
+            bending_moments[i:i+step] = A*self.x - \
+                (P @ np.maximum(passed, 0, out=passed))[:, 0]
+
+        return shear_forces, bending_moments
+
+    def get_on_span(self, load_positions: Iterable) -> np.ndarray:
+        """get if each load position is on the span, loads off the span are carried directly by the supports
+
+        Args:
+            load_positions (Iterable): load positions
+
+        Returns:
+            np.ndarray: True where the load is on the span
+        """
+        return self.__return_on_span(np.asarray(load_positions, dtype=float))
+
+    def __return_on_span(self, a: np.ndarray) -> np.ndarray:
+        """return if the load positions are on the span
+
+        Args:
+            a (np.ndarray): load positions
+
+        Returns:
+            np.ndarray: True where the load is on the span
+        """
+        return (a >= 0) & (a <= self.length)
@@ -0,0 +1,190 @@
+from typing import Iterable, NamedTuple
+
+import numpy as np
+
+from src import constants, influence, train
+
+
+class LoadCases(NamedTuple):
+    """point loads on a bridge for a batch of load cases, arrays have the shape (load cases, point loads)
+
+    Attributes:
+        positions (np.ndarray): x of each point load
+        loads (np.ndarray): force of each point load, positive values
+    """
+    positions: np.ndarray
+    loads: np.ndarray
+
+    def __len__(self) -> int:
+        return self.positions.shape[0]
+
+
+class LoadCaseResult(NamedTuple):
+    """the forces in a bridge for every load case, arrays are read only and have the shape (load cases, x)
+
+    Attributes:
+        x (np.ndarray): positions along the bridge
+        reactions (np.ndarray): (A, B) of each load case, shape (load cases, 2)
+        shear_forces (np.ndarray): shear force diagram of each load case
+        bending_moments (np.ndarray): bending moment diagram of each load case
+    """
+    x: np.ndarray
+    reactions: np.ndarray
+    shear_forces: np.ndarray
+    bending_moments: np.ndarray
+
+
+class LoadModel:
+    def __init__(self, offsets: Iterable, loads: Iterable, length=None, name=None) -> None:
+        """create a group of point loads that move together, i.e. the axles of a train
+
+        Args:
+            offsets (Iterable): position of each axle relative to the left-most position of the vehicle
+            loads (Iterable): force of each axle, index should match offsets
+            length (number, optional): length of the vehicle. Defaults to the same overhang past the last axle as before the first.
+            name (str, optional): name of the vehicle
+        """
+        self.offsets = np.array(offsets, dtype=float).reshape(-1)
+        self.loads = np.broadcast_to(
+            np.asarray(loads, dtype=float), self.offsets.shape).copy()
+        if length is None:
+            length = float(self.offsets.max()+self.offsets.min()
+                           ) if len(self.offsets) else 0.0
+        self.length = length
+        self.name = name
+
+        self.offsets.setflags(write=False)
+        self.loads.setflags(write=False)
+
+    def get_weight(self) -> float:
+        """get the total weight
+
+        Returns:
+            float: sum of the axle loads
+        """
+        return float(self.loads.sum())
+
+    def get_scaled(self, weight: float) -> object:
+        """get the same axle layout with the loads scaled to a total weight
+
+        Args:
+            weight (number): total weight
+
+        Returns:
+            LoadModel: scaled load model
+        """
+        return LoadModel(self.offsets, self.loads*(weight/self.get_weight()), self.length, self.name)
+
+    def check_symmetric(self) -> bool:
+        """check if the vehicle is the same when turned around, the axles mirrored about the middle of its length
+        (within PRECISION) carry the same loads
+
+        Returns:
+            bool: True if symmetric
+        """
+        order = np.argsort(self.offsets, kind='stable')
+        offsets = np.round(self.offsets[order]/constants.PRECISION)
+        mirrored = np.round((self.length-self.offsets[order][::-1])/constants.PRECISION)
+
+        return bool(np.array_equal(offsets, mirrored) and np.allclose(self.loads[order], self.loads[order][::-1]))
+
+    def get_load_cases(self, positions: Iterable) -> LoadCases:
+        """get the load case of the vehicle at every position
+
+        Args:
+            positions (Iterable): left-most positions of the vehicle
+
+        Returns:
+            LoadCases: one load case per position
+        """
+        positions = np.asarray(positions, dtype=float).reshape(-1)
+
+        return LoadCases(positions[:, np.newaxis]+self.offsets, np.broadcast_to(self.loads, (len(positions), len(self.loads))))
+
+
+def get_train(weight=400) -> LoadModel:
+    """get the load model of the train, see train.Train
+
+    Args:
+        weight (number, optional): weight of the train. Defaults to 400.
+
+    Returns:
+        LoadModel: six equal axles
+    """
+    t = train.Train(0, weight)
+
+    return LoadModel(t.get_wheel_positions(), t.get_point_loads(), name='train')
+
+
+def get_consist(vehicles: Iterable, gap=0, name=None) -> LoadModel:
+    """get one load model of vehicles coupled left to right, i.e. a locomotive followed by cars
+
+    Args:
+        vehicles (Iterable): LoadModel of each vehicle, left-most first
+        gap (number, optional): space between the end of one vehicle and the start of the next. Defaults to 0.
+        name (str, optional): name of the consist
+
+    Returns:
+        LoadModel: every axle of the vehicles
+    """
+    offsets = []
+    loads = []
+    start = 0
+    for vehicle in vehicles:
+        offsets.append(vehicle.offsets+start)
+        loads.append(vehicle.loads)
+        start += vehicle.length+gap
+
+    return LoadModel(np.concatenate(offsets), np.concatenate(loads), start-gap, name)
+
+
+def combine(*load_cases: LoadCases) -> LoadCases:
+    """combine load cases acting at the same time, i.e. two trains on the bridge, the load cases are
+    paired in order and a batch of one load case is paired with every load case of the others
+
+    Args:
+        *load_cases (LoadCases): load cases of each vehicle
+
+    Returns:
+        LoadCases: every point load of the paired load cases
+    """
+    cases = max(len(case) for case in load_cases)
+    for case in load_cases:
+        if len(case) not in (1, cases):
+            raise ValueError(
+                f'cannot pair {len(case)} load cases with {cases} load cases')
+
+    return LoadCases(np.concatenate([np.broadcast_to(case.positions, (cases, case.positions.shape[1])) for case in load_cases], axis=1),
+                     np.concatenate([np.broadcast_to(case.loads, (cases, case.loads.shape[1])) for case in load_cases], axis=1))
+
+
+def solve(Bridge: object, load_cases: LoadCases, x=None, subdivisions=constants.SUBDIVISIONS) -> LoadCaseResult:
+    """solve the reactions, shear force diagram and bending moment diagram of every load case at once,
+    loads off the span are carried directly by the supports
+
+    Args:
+        Bridge (object): Bridge object
+        load_cases (LoadCases): load cases, i.e. from LoadModel.get_load_cases or combine
+        x (Iterable, optional): positions along the bridge. Defaults to the sample points of the bridge.
+        subdivisions (int, optional): how many x to solve at if x is not given. Defaults to constants.SUBDIVISIONS.
+
+    Returns:
+        LoadCaseResult: the forces of each load case
+    """
+    x = Bridge.get_sample_points(subdivisions) if x is None else np.array(
+        x, dtype=float)
+    lines = influence.InfluenceLines(Bridge.length, x)
+
+    positions = np.asarray(load_cases.positions, dtype=float)
+    loads = np.where(lines.get_on_span(positions), load_cases.loads, 0)
+
+    reactions = np.stack(Bridge.calculate_reaction_forces(
+        positions, loads), axis=-1).reshape(-1, 2)
+    shear_forces, bending_moments = lines.get_load_case_forces(
+        positions, loads)
+
+    arrays = (lines.x, reactions, shear_forces, bending_moments)
+    for array in arrays:
+        array.setflags(write=False)
+
+    return LoadCaseResult(*arrays)
@@ -0,0 +1,121 @@
+from typing import Iterable
+
+import numpy as np
+
+
+class RectArray:
+    def __init__(self, geometry_objects: Iterable) -> None:
+        """create a compact copy of the dimensions of Rect() geometry objects, each held in one read only array
+        indexed like geometry_objects
+
+        Args:
+            geometry_objects (Iterable): an array of geometry_object
+        """
+        geometry_objects = tuple(geometry_objects)
+
+        dimensions = np.array([(geo.x, geo.y, geo.x_length, geo.y_length)
+                              for geo in geometry_objects], dtype=float).reshape(-1, 4)
+
+        self.x, self.y, self.x_length, self.y_length = (
+            np.ascontiguousarray(column) for column in dimensions.T)
+        self.area = self.x_length*self.y_length
+        self.right = self.x+self.x_length
+        self.bottom = self.y-self.y_length
+        self.centroids = (self.y_length/2)+self.y-self.y_length
+
+        self.horizontal = self.x_length > self.y_length
+        self.vertical = self.x_length < self.y_length
+        self.display = np.array([bool(geo.get_tag('display'))
+                                for geo in geometry_objects], dtype=bool)
+        self.names = tuple(geo.name for geo in geometry_objects)
+
+        for array in (self.x, self.y, self.x_length, self.y_length, self.area, self.right, self.bottom,
+                      self.centroids, self.horizontal, self.vertical, self.display):
+            array.setflags(write=False)
+
+        self.__profiles = None
+
+    def __len__(self) -> int:
+        return len(self.x)
+
+    def find_area(self) -> float:
+        """find the total area
+
+        Returns:
+            number: area
+        """
+        return float(self.area.sum())
+
+    def find_centroid(self) -> float:
+        """find the centroid relative to y = 0, assumes the centroid is horizontal
+
+        Returns:
+            number: centroid relative to y = 0
+        """
+        return float((self.centroids*self.area).sum()/self.area.sum())
+
+    def find_I(self, centroid=None) -> float:
+        """find the I, assumes the axis is a horizontal line
+
+        Args:
+            centroid (number, optional): centroid if already found. Defaults to None.
+
+        Returns:
+            number: I
+        """
+        if centroid is None:
+            centroid = self.find_centroid()
+
+        return float((self.x_length*self.y_length**3/12 + self.area*(centroid-self.centroids)**2).sum())
+
+    def find_top(self, centroid: float) -> float:
+        """find the top, the centroid if nothing is above it
+
+        Args:
+            centroid (number): centroid
+
+        Returns:
+            number: the y value of the top
+        """
+        return float(max(centroid, self.y.max(initial=-np.inf)))
+
+    def find_bottom(self, centroid: float) -> float:
+        """find the bottom, the centroid if nothing is below it
+
+        Args:
+            centroid (number): centroid
+
+        Returns:
+            number: the y value of the bottom
+        """
+        return float(min(centroid, self.bottom.min(initial=np.inf)))
+
+    def get_profiles(self) -> tuple:
+        """return the width profile, built once from the top and bottom of every rect
+
+        the width is constant between two consecutive breakpoints, so the area and first moment of area
+        below any y are linear and quadratic within them
+
+        Returns:
+            (np.ndarray, np.ndarray, np.ndarray, np.ndarray): breakpoints, width between each breakpoint,
+            area below each breakpoint, first moment of area about y = 0 below each breakpoint
+        """
+        if self.__profiles is None:
+            breaks = np.unique(np.concatenate((self.bottom, self.y)))
+
+            widths = np.zeros(len(breaks))
+            np.add.at(widths, np.searchsorted(
+                breaks, self.bottom), self.x_length)
+            np.add.at(widths, np.searchsorted(breaks, self.y), -self.x_length)
+            widths = np.cumsum(widths)[:-1]
+
+            areas = np.concatenate(([0], np.cumsum(widths*np.diff(breaks))))
+            moments = np.concatenate(
+                ([0], np.cumsum(widths*np.diff(breaks**2)/2)))
+
+            for array in (breaks, widths, areas, moments):
+                array.setflags(write=False)
+
+            self.__profiles = breaks, widths, areas, moments
+
+        return self.__profiles
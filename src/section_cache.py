@@ -0,0 +1,163 @@
+import hashlib
+import os
+import pickle
+from typing import Iterable
+
+from src import geometry_collection
+
+CACHE_VERSION = 2  # change when what a geometry collection finds changes, old records are then never read
+DEFAULT_DIRECTORY = '.section_cache'
+DEFAULT_MAX_BYTES = 64*2**20
+
+
+def get_hash(geometry_objects: Iterable, geometry_object_groups=(), name=None, ignore_thin_plate=False, joint_override=None) -> str:
+    """get the content hash of a geometry collection from the arguments it is created with,
+    coordinates are snapped to the PRECISION grid so round off does not change the hash
+
+    Args:
+        geometry_objects (Iterable): an array of geometry_object
+        geometry_object_groups (Iterable): (ID, ID, ...), (ID, ID, ...), ...
+        name (str, optional): name of the collection
+        ignore_thin_plates (bool, optional): True to disable thin plate identification
+        joint_override (list, optional): joints that should be used for calculations
+
+    Returns:
+        str: hex digest
+    """
+    snap = geometry_collection.snap
+
+    content = (CACHE_VERSION, name, bool(ignore_thin_plate),
+               tuple(tuple(group) for group in geometry_object_groups),
+               tuple(tuple((snap(x), snap(y)) for x, y in joint) for joint in joint_override) if joint_override else None,
+               tuple((snap(geo.x), snap(geo.y), snap(geo.x_length), snap(geo.y_length), geo.id, geo.name, geo.join_id,
+                      geo.special_id, geo.tags.get_tags_str()) for geo in geometry_objects))
+
+    return hashlib.sha256(repr(content).encode()).hexdigest()
+
+
+class SectionCache:
+    def __init__(self, directory=DEFAULT_DIRECTORY, max_bytes=DEFAULT_MAX_BYTES) -> None:
+        """create a cache of what geometry collections find, kept as one pickle record per collection in a directory,
+        the least recently used records are removed when the directory grows past max_bytes
+
+        safe to share between processes, records are written to a temporary file then renamed
+
+        Args:
+            directory (str, optional): directory of the records, created if missing. Defaults to DEFAULT_DIRECTORY.
+            max_bytes (int, optional): size the records are kept under. Defaults to 64 MiB.
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+        os.makedirs(directory, exist_ok=True)
+
+    def get_collection(self, geometry_objects: Iterable, geometry_object_groups=(), name=None, ignore_thin_plate=False, joint_override=None) -> object:
+        """create a geometry collection, using the record of an identical collection if there is one,
+        arguments are the same as GeometryCollection
+
+        Returns:
+            GeometryCollection: the geometry collection
+        """
+        geometry_objects = tuple(geometry_objects)
+        key = get_hash(geometry_objects, geometry_object_groups,
+                       name, ignore_thin_plate, joint_override)
+
+        collection = geometry_collection.GeometryCollection(
+            geometry_objects, geometry_object_groups, name, ignore_thin_plate, joint_override)
+
+        state = self.load(key)
+        if state is not None:
+            try:
+                collection.set_state(state)
+                self.hits += 1
+                return collection
+            except (KeyError, ValueError, TypeError):
+                collection = geometry_collection.GeometryCollection(
+                    geometry_objects, geometry_object_groups, name, ignore_thin_plate, joint_override)
+
+        self.misses += 1
+        self.store(key, collection.get_state())
+
+        return collection
+
+    def load(self, key: str) -> dict:
+        """load a record, its last use is updated
+
+        Args:
+            key (str): hash of the collection
+
+        Returns:
+            dict | None: state of the collection, None if there is no readable record
+        """
+        path = self.__return_path(key)
+        try:
+            with open(path, 'rb') as file:
+                state = pickle.load(file)
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ValueError):
+            self.__remove(path)
+            return None
+
+        return state
+
+    def store(self, key: str, state: dict) -> None:
+        """store a record then remove the least recently used records past max_bytes
+
+        Args:
+            key (str): hash of the collection
+            state (dict): state of the collection
+        """
+        path = self.__return_path(key)
+        temporary = f'{path}.{os.getpid()}.tmp'
+
+        with open(temporary, 'wb') as file:
+            pickle.dump(state, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary, path)
+
+        self.__evict()
+
+    def clear(self) -> None:
+        """remove every record
+        """
+        for entry in self.__return_records():
+            self.__remove(entry.path)
+
+    def __evict(self) -> None:
+        """remove the least recently used records until the records fit in max_bytes
+        """
+        records = []
+        for entry in self.__return_records():
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            records.append((stat.st_mtime, stat.st_size, entry.path))
+
+        size = sum(record[1] for record in records)
+        for _, record_size, path in sorted(records):
+            if size <= self.max_bytes:
+                break
+            self.__remove(path)
+            size -= record_size
+
+    def __return_records(self) -> list:
+        """return the directory entries of every record
+
+        Returns:
+            list: os.DirEntry of each record
+        """
+        with os.scandir(self.directory) as entries:
+            return [entry for entry in entries if entry.name.endswith('.pickle')]
+
+    def __return_path(self, key: str) -> str:
+        return os.path.join(self.directory, f'{key}.pickle')
+
+    def __remove(self, path: str) -> None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
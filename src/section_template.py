@@ -0,0 +1,122 @@
+from typing import Callable
+
+import numpy as np
+
+from src import constants
+
+
+class SectionTemplate:
+    def __init__(self, factory: Callable) -> None:
+        """create a parametric cross section, the joints of an instance are reused by every later instance
+        with the same layout instead of being found again
+
+        the layout is the order of every rect side along x and along y, sides within PRECISION counted as equal.
+        Which sides touch only depends on that order, so only the joint coordinates have to be recomputed
+
+        Args:
+            factory (Callable): factory(**dimensions) returning a GeometryCollection, i.e. make_extension in design-final.py
+        """
+        self.factory = factory
+        self.hits = 0
+        self.misses = 0
+        self.__topologies = {}
+
+    def instantiate(self, **dimensions) -> object:
+        """create the cross section for a set of dimensions
+
+        Args:
+            **dimensions: arguments of the factory
+
+        Returns:
+            GeometryCollection: the cross section
+        """
+        collection = self.factory(**dimensions)
+        rects = collection.rect_array
+
+        layout = self.__return_layout(rects)
+        topology = self.__topologies.get(layout)
+
+        if topology is None:
+            self.misses += 1
+            topology = self.__return_topology(
+                collection.get_joint_pairs(), self.__return_vertices(rects))
+            if topology is not None:
+                self.__topologies[layout] = topology
+            return collection
+
+        self.hits += 1
+        vertices = self.__return_vertices(rects)
+
+        joints = []
+        folds = []
+        for i, (joint_sources, fold_sources) in enumerate(topology):
+            joints.append([[vertices[owner][v] for v in indices]
+                          for owner, indices in joint_sources])
+            folds.append([[vertices[owner][v] for v in indices]
+                         for owner, indices in fold_sources])
+
+        collection.set_joints(joints, folds)
+
+        return collection
+
+    def __return_layout(self, rects: object) -> tuple:
+        """return the layout of the rects, the rank of every side along x and along y
+
+        Args:
+            rects (RectArray): rects of the collection
+
+        Returns:
+            tuple: hashable layout
+        """
+        def ranks(sides):
+            snapped = np.round(np.concatenate(sides)/constants.PRECISION)
+            return np.unique(snapped, return_inverse=True)[1].astype(np.int32).tobytes()
+
+        return len(rects), ranks((rects.x, rects.right)), ranks((rects.bottom, rects.y))
+
+    def __return_vertices(self, rects: object) -> list:
+        """return the vertices of every rect, matching Rect.get_vertices
+
+        Args:
+            rects (RectArray): rects of the collection
+
+        Returns:
+            list: vertices of each rect
+        """
+        return [((x, y), (right, y), (right, bottom), (x, bottom)) for x, y, right, bottom in zip(
+            rects.x.tolist(), rects.y.tolist(), rects.right.tolist(), rects.bottom.tolist())]
+
+    def __return_topology(self, pairs: list, vertices: list) -> list:
+        """return which rect and corners make up every joint and fold
+
+        Args:
+            pairs (list): from GeometryCollection.get_joint_pairs
+            vertices (list): vertices of each rect
+
+        Returns:
+            list | None: for each rect ([(rect, corner indices), ...] for joints, [...] for folds), None if a joint is not made
+            of the corners of one rect
+        """
+        if pairs is None:
+            return None
+
+        def sources(i, found):
+            result = []
+            for j, joint in found:
+                # a joint is made of the corners of the other rect if it has them, see __find_collinear_side
+                owner = j if all(vertex in vertices[j] for vertex in joint) else i
+                if not all(vertex in vertices[owner] for vertex in joint):
+                    return None
+                result.append((owner, tuple(vertices[owner].index(vertex)
+                                            for vertex in joint)))
+            return result
+
+        topology = []
+        for i, (joint_pairs, fold_pairs) in enumerate(pairs):
+            joint_sources = sources(i, joint_pairs)
+            fold_sources = sources(i, fold_pairs)
+            if joint_sources is None or fold_sources is None:
+                return None
+            topology.append((joint_sources, fold_sources))
+
+        return topology
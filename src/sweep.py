@@ -0,0 +1,154 @@
+import csv
+import itertools
+import os
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Iterable, Iterator
+
+from src import analysis, constants, validation
+
+RESULT_COLUMNS = ('error', 'Tension', 'Compression', 'Shear, Centroid', 'Shear, Glue Joint', 'Thin Plate Buckling k=4',
+                  'Thin Plate Buckling k=0.425', 'Thin Plate Buckling k=6', 'Thin Plate Shear k=5',
+                  'Minimum FOS', 'Governing Mode', 'Failure Load', 'Critical x', 'Train Position',
+                  'Governing Section')  # columns after the parameters of every row
+
+
+def get_parameter_grid(parameters: dict) -> list:
+    """get every combination of the parameter values
+
+    Args:
+        parameters (dict): {name: (value, value, ...), ...}
+
+    Returns:
+        list: [{name: value, ...}, ...] in the order of the parameters
+    """
+    names = tuple(parameters)
+
+    return [dict(zip(names, values)) for values in itertools.product(*(parameters[name] for name in names))]
+
+
+def run(factory: Callable, parameters: Iterable, train_weight=400, movement_increment=10, engine='influence',
+        subdivisions=constants.SUBDIVISIONS, workers=None, chunksize=None, validate=False) -> Iterator:
+    """analyze a design for every set of parameters across a pool of processes, rows are yielded in the order of the parameters as they finish
+
+    the factory is called inside the worker processes so it has to be picklable, i.e. a function defined at the top level of a module
+    that does not run a design script on import
+
+    Args:
+        factory (Callable): factory(**params) returning a Bridge object
+        parameters (Iterable): sets of parameters, i.e. from get_parameter_grid, or a dict to be passed to get_parameter_grid
+        train_weight (number, optional): weight of the train. Defaults to 400.
+        movement_increment (number, optional): how much to move the train. Defaults to 10.
+        engine (str, optional): envelope engine, see envelope.solve. Defaults to 'influence'.
+        subdivisions (int, optional): how many x to solve at. Defaults to constants.SUBDIVISIONS.
+        workers (int, optional): number of processes, 1 to run in this process. Defaults to every core.
+        chunksize (int, optional): designs sent to a process at a time. Defaults to spreading the designs over 4 chunks per process.
+        validate (bool | Iterable, optional): True to skip the analysis of designs failing validation.validate_bridge,
+            or the kinds of problems to allow. Defaults to False.
+
+    Yields:
+        dict: the parameters then RESULT_COLUMNS, 'error' is None, the traceback of a failed design or the problems of an invalid design,
+        'Shear, Glue Joint' is the lowest FOS of every glue joint
+    """
+    if isinstance(parameters, dict):
+        parameters = get_parameter_grid(parameters)
+    parameters = list(parameters)
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    if validate is True:
+        validate = ()
+    elif validate is False:
+        validate = None
+    else:
+        validate = tuple(validate)
+
+    tasks = [(factory, params, train_weight, movement_increment, engine, subdivisions, validate)
+             for params in parameters]
+
+    if workers == 1 or len(tasks) <= 1:
+        yield from map(__return_row, tasks)
+        return
+
+    if chunksize is None:
+        chunksize = max(1, len(tasks)//(workers*4))
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(__return_row, tasks, chunksize=chunksize)
+
+
+def write_csv(rows: Iterable, path: str) -> int:
+    """write the rows of a sweep to a csv file while they are produced, columns missing from a row are left blank
+
+    Args:
+        rows (Iterable): rows yielded by run
+        path (str): path of the csv file
+
+    Returns:
+        int: number of rows written
+    """
+    rows = iter(rows)
+    first = next(rows, None)
+    if first is None:
+        open(path, 'w', newline='').close()
+        return 0
+
+    count = 0
+    with open(path, 'w', newline='') as file:
+        parameters = [key for key in first if key not in RESULT_COLUMNS]
+        writer = csv.DictWriter(file, fieldnames=parameters+list(
+            RESULT_COLUMNS), restval='', extrasaction='ignore')
+        writer.writeheader()
+        for row in itertools.chain((first,), rows):
+            writer.writerow(row)
+            count += 1
+
+    return count
+
+
+def __return_row(task: tuple) -> dict:
+    """build and analyze one design, exceptions are returned in the row instead of stopping the sweep
+
+    Args:
+        task (tuple): (factory, params, train_weight, movement_increment, engine, subdivisions, validate)
+
+    Returns:
+        dict: row of the results table
+    """
+    factory, params, train_weight, movement_increment, engine, subdivisions, validate = task
+
+    row = dict(params)
+    try:
+        Bridge = factory(**params)
+
+        if validate is not None:
+            problems = validation.validate_bridge(Bridge).issues
+            problems = [issue.message for issue in problems if issue.kind not in validate]
+            if problems:
+                row['error'] = 'invalid design: '+'; '.join(problems)
+                return row
+
+        report = analysis.analyze(Bridge, train_weight=train_weight,
+                                  movement_increment=movement_increment, engine=engine, subdivisions=subdivisions)
+    except Exception:
+        row['error'] = traceback.format_exc()
+        return row
+
+    row['error'] = None
+    for mode in report.modes:
+        if mode.name.startswith('Shear, Glue Joint'):
+            row['Shear, Glue Joint'] = min(
+                mode.fos, row.get('Shear, Glue Joint', float('inf')))
+        else:
+            row[mode.name] = mode.fos
+
+    minimum = report.get_minimum()
+    row['Minimum FOS'] = minimum.fos
+    row['Governing Mode'] = minimum.name
+    row['Failure Load'] = minimum.failure_load
+    row['Critical x'] = minimum.critical_x
+    row['Train Position'] = minimum.train_position
+    row['Governing Section'] = minimum.section
+
+    return row
@@ -0,0 +1,309 @@
+import bisect
+import heapq
+from typing import Iterable, NamedTuple
+
+import numpy as np
+
+from src import constants
+
+
+class ValidationIssue(NamedTuple):
+    """a problem found with a cross section or bridge
+
+    Attributes:
+        kind (str): 'overlap', 'gap', 'disconnected', 'height', 'depth', 'deck width', 'span' or 'bounds'
+        message (str): description of the problem
+        objects (tuple): names of the geometry objects or cross sections involved
+    """
+    kind: str
+    message: str
+    objects: tuple
+
+
+class ValidationReport(NamedTuple):
+    """every problem found with a cross section or bridge
+
+    Attributes:
+        issues (tuple): ValidationIssue of each problem
+    """
+    issues: tuple
+
+    def is_valid(self, ignore=()) -> bool:
+        """check if there are no problems
+
+        Args:
+            ignore (Iterable, optional): kinds of problems that are allowed. Defaults to ().
+
+        Returns:
+            bool: True if there are no problems that are not ignored
+        """
+        return not any(issue.kind not in ignore for issue in self.issues)
+
+    def get_issues(self, kind: str) -> tuple:
+        """get the problems of one kind
+
+        Args:
+            kind (str): kind of problem
+
+        Returns:
+            tuple: ValidationIssue of each problem of that kind
+        """
+        return tuple(issue for issue in self.issues if issue.kind == kind)
+
+
+def validate_cross_section(GeometryCollection: object, testing_setup=constants.TESTING_SETUP, max_gap=constants.MATERIAL_PROPERTIES['mat_board']['dimensions'][2]) -> ValidationReport:
+    """check a cross section for overlapping rects, rects almost touching, parts not connected to the rest and
+    dimensions outside of the testing setup, without finding joints or thin plates
+
+    rects are swept along x in order of their left side, the rects still in reach of it are indexed by y so each is
+    only compared to the rects within max_gap of it, O(n log n) plus the pairs found
+
+    a gap is only reported between rects in parts not connected to each other, rects joined through a third rect,
+    i.e. the layers of a laminate, are fine. helper rects named '!exclude' or tagged 'display:False' are not checked
+
+    Args:
+        GeometryCollection (object): GeometryCollection object
+        testing_setup (dict, optional): limits of the bridge. Defaults to constants.TESTING_SETUP.
+        max_gap (number, optional): spaces between two rects less than this are reported as a gap. Defaults to the thickness of mat board.
+
+    Returns:
+        ValidationReport: the problems found
+    """
+    rects = GeometryCollection.rect_array
+    names = rects.names
+    issues = []
+
+    structural = rects.display & np.array(
+        [name != '!exclude' for name in names], dtype=bool).reshape(-1)
+    indices = np.flatnonzero(structural).tolist()
+
+    x, right, y, bottom = (array.tolist()
+                           for array in (rects.x, rects.right, rects.y, rects.bottom))
+    precision = constants.PRECISION
+
+    parents = list(range(len(rects)))
+
+    def find(i):
+        while parents[i] != i:
+            parents[i] = parents[parents[i]]
+            i = parents[i]
+        return i
+
+    gaps = []
+    active = []  # (right+max_gap, index), rects that can still reach the next left side
+    intervals = __IntervalIndex(bottom[i] for i in indices)
+    for i in sorted(indices, key=x.__getitem__):
+        while active and active[0][0] < x[i]-precision:
+            j = heapq.heappop(active)[1]
+            intervals.remove(j, bottom[j], y[j])
+
+        for j in sorted(intervals.find(bottom[i]-max_gap, y[i]+max_gap)):
+            x_overlap = min(right[i], right[j])-max(x[i], x[j])
+            y_overlap = min(y[i], y[j])-max(bottom[i], bottom[j])
+
+            if x_overlap > precision and y_overlap > precision:
+                issues.append(ValidationIssue(
+                    'overlap', f'{names[j]} and {names[i]} overlap by {x_overlap:.3f} x {y_overlap:.3f}', (names[j], names[i])))
+                parents[find(i)] = find(j)
+            elif x_overlap >= -precision and y_overlap >= -precision:
+                if x_overlap > precision or y_overlap > precision:  # touching along more than a corner
+                    parents[find(i)] = find(j)
+            elif (-max_gap+precision < x_overlap and y_overlap > precision) or (-max_gap+precision < y_overlap and x_overlap > precision):
+                gaps.append((j, i, -min(x_overlap, y_overlap)))
+
+        heapq.heappush(active, (right[i]+max_gap, i))
+        intervals.add(i, bottom[i], y[i])
+
+    for j, i, gap in gaps:
+        if find(i) != find(j):
+            issues.append(ValidationIssue(
+                'gap', f'{names[j]} and {names[i]} are {gap:.3f} apart', (names[j], names[i])))
+
+    parts = {}
+    for i in indices:
+        parts.setdefault(find(i), []).append(names[i])
+    if len(parts) > 1:
+        for part in sorted(parts.values(), key=len)[:-1]:
+            issues.append(ValidationIssue(
+                'disconnected', f'{", ".join(map(str, part))} not connected to the rest of {GeometryCollection.name}', tuple(part)))
+
+    if indices:
+        height = float(rects.y[structural].max()-rects.bottom[structural].min())
+        if height > testing_setup['max_height']+precision:
+            issues.append(ValidationIssue(
+                'height', f'{GeometryCollection.name} is {height:.3f} tall, more than {testing_setup["max_height"]}', ()))
+
+        depth = float(rects.right[structural].max()-rects.x[structural].min())
+        if depth > testing_setup['max_depth']+precision:
+            issues.append(ValidationIssue(
+                'depth', f'{GeometryCollection.name} is {depth:.3f} wide, more than {testing_setup["max_depth"]}', ()))
+
+        deck = structural & (rects.y >= rects.y[structural].max()-precision)
+        deck_width = float(rects.right[deck].max()-rects.x[deck].min())
+        if deck_width < testing_setup['deck_width']-precision:
+            issues.append(ValidationIssue(
+                'deck width', f'the deck of {GeometryCollection.name} is {deck_width:.3f} wide, less than {testing_setup["deck_width"]}',
+                tuple(name for name, top in zip(names, deck) if top)))
+
+    return ValidationReport(tuple(issues))
+
+
+class __IntervalIndex:
+    def __init__(self, bottoms: Iterable) -> None:
+        """create an index of closed y intervals that are added and removed, finding the intervals that reach
+        a range of y is O(log n) plus the intervals found
+
+        intervals starting in the range are found by bisecting a list sorted by their bottom, intervals starting below
+        the range are found from a segment tree over the bottoms, each node holds the intervals covering all of its bottoms
+
+        Args:
+            bottoms (Iterable): bottom of every interval that can be added
+        """
+        self.bottoms = sorted(set(bottoms))
+        self.size = 1
+        while self.size < len(self.bottoms):
+            self.size *= 2
+        self.nodes = {}
+        self.starts = []  # (bottom, index), sorted
+
+    def add(self, index: int, bottom: float, top: float) -> None:
+        """add an interval
+
+        Args:
+            index (int): identifies the interval
+            bottom (number): bottom of the interval, one of the bottoms given when created
+            top (number): top of the interval
+        """
+        bisect.insort(self.starts, (bottom, index))
+        for node in self.__return_nodes(bottom, top):
+            self.nodes.setdefault(node, set()).add(index)
+
+    def remove(self, index: int, bottom: float, top: float) -> None:
+        """remove an interval, the same bottom and top as added
+
+        Args:
+            index (int): identifies the interval
+            bottom (number): bottom of the interval
+            top (number): top of the interval
+        """
+        del self.starts[bisect.bisect_left(self.starts, (bottom, index))]
+        for node in self.__return_nodes(bottom, top):
+            self.nodes[node].discard(index)
+
+    def find(self, lower: float, upper: float) -> list:
+        """find the intervals that reach from lower to upper, within PRECISION
+
+        Args:
+            lower (number): bottom of the range
+            upper (number): top of the range
+
+        Returns:
+            list: index of each interval
+        """
+        lower -= constants.PRECISION
+        upper += constants.PRECISION
+
+        found = [index for _, index in self.starts[bisect.bisect_left(self.starts, (lower, -1)):
+                                                   bisect.bisect_right(self.starts, (upper, float('inf')))]]
+
+        # intervals starting below lower that cover it, held by the nodes above the last bottom below lower
+        node = bisect.bisect_left(self.bottoms, lower)-1
+        if node >= 0:
+            node += self.size
+            while node:
+                found.extend(self.nodes.get(node, ()))
+                node //= 2
+
+        return found
+
+    def __return_nodes(self, bottom: float, top: float) -> list:
+        """return the nodes covering the bottoms from bottom to top, every interval covering lower is held by a node
+        above the last bottom below lower, with a few ending between that bottom and lower
+
+        Args:
+            bottom (number): bottom of the interval
+            top (number): top of the interval
+
+        Returns:
+            list: the nodes
+        """
+        lower = bisect.bisect_left(self.bottoms, bottom)+self.size
+        upper = bisect.bisect_right(self.bottoms, top)+self.size
+
+        nodes = []
+        while lower < upper:
+            if lower % 2:
+                nodes.append(lower)
+                lower += 1
+            if upper % 2:
+                upper -= 1
+                nodes.append(upper)
+            lower //= 2
+            upper //= 2
+
+        return nodes
+
+
+def validate_bridge(Bridge: object, testing_setup=constants.TESTING_SETUP, max_gap=constants.MATERIAL_PROPERTIES['mat_board']['dimensions'][2]) -> ValidationReport:
+    """check every unique cross section of a bridge, that the bounds of the cross sections cover the bridge
+    without overlapping and that the bridge can span the testing setup
+
+    Args:
+        Bridge (object): Bridge object
+        testing_setup (dict, optional): limits of the bridge. Defaults to constants.TESTING_SETUP.
+        max_gap (number, optional): largest space between two rects reported as a gap. Defaults to the thickness of mat board.
+
+    Returns:
+        ValidationReport: the problems found
+    """
+    issues = []
+
+    if Bridge.length < testing_setup['min_span']:
+        issues.append(ValidationIssue(
+            'span', f'the bridge is {Bridge.length} long, less than {testing_setup["min_span"]}', ()))
+    elif Bridge.length > testing_setup['max_span']:
+        issues.append(ValidationIssue(
+            'span', f'the bridge is {Bridge.length} long, more than {testing_setup["max_span"]}', ()))
+
+    issues.extend(__return_bound_issues(
+        Bridge.cross_sections, Bridge.length))
+
+    for cross_section in Bridge.cross_sections.unique_cross_sections:
+        issues.extend(validate_cross_section(
+            cross_section, testing_setup, max_gap).issues)
+
+    return ValidationReport(tuple(issues))
+
+
+def __return_bound_issues(CrossSections: object, length: float) -> list:
+    """return where the bounds of the cross sections leave part of the bridge uncovered or cover it twice,
+    bounds that only share an end are fine
+
+    Args:
+        CrossSections (object): CrossSections object
+        length (number): length of the bridge
+
+    Returns:
+        list: ValidationIssue of each problem
+    """
+    precision = constants.PRECISION
+    bounds = sorted((float(lower), float(upper), getattr(section, 'name', None))
+                    for section, (lower, upper) in zip(CrossSections.cross_sections, CrossSections.bounds))
+
+    issues = []
+    reach, last = 0, None
+    for lower, upper, name in bounds:
+        if lower > reach+precision:
+            issues.append(ValidationIssue(
+                'bounds', f'no cross section between {reach} and {lower}', (last, name)))
+        elif lower < reach-precision:
+            issues.append(ValidationIssue(
+                'bounds', f'cross sections overlap between {lower} and {min(reach, upper)}', (last, name)))
+        if upper > reach:
+            reach, last = upper, name
+
+    if reach < length-precision:
+        issues.append(ValidationIssue(
+            'bounds', f'no cross section between {reach} and {length}', (last, None)))
+
+    return issues
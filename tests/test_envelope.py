@@ -0,0 +1,28 @@
+import numpy as np
+
+from src import bridge, envelope, geometry_collection, geometry_object
+
+
+def make_bridge():
+    top = geometry_object.Rect(0, 75+1.27, 100, 1.27, name='top')
+    left = geometry_object.Rect(10, 75, 1.27, 75, name='vertical-left')
+    right = geometry_object.Rect(90-1.27, 75, 1.27, 75, name='vertical-right')
+    bottom = geometry_object.Rect(10+1.27, 1.27, 80-2*1.27, 1.27, name='bottom')
+    section = geometry_collection.GeometryCollection(
+        (top, left, right, bottom), name='section', ignore_thin_plate=True)
+
+    return bridge.Bridge(1200, bridge.CrossSections((section,), ((0, 1200),), ('section',)))
+
+
+def test_exact_envelope_does_not_depend_on_the_increment():
+    b = make_bridge()
+    expected = envelope.solve(b, 400, 10, engine='exact', cache=False)
+
+    for movement_increment in (7, 100):
+        result = envelope.solve(b, 400, movement_increment, engine='exact', cache=False)
+
+        np.testing.assert_array_equal(result.shear_forces, expected.shear_forces)
+        np.testing.assert_array_equal(result.bending_moments, expected.bending_moments)
+        np.testing.assert_array_equal(result.shear_positions, expected.shear_positions)
+        np.testing.assert_array_equal(result.bending_positions, expected.bending_positions)
+
@@ -0,0 +1,15 @@
+import pytest
+
+from src import geometry_collection, geometry_object
+
+
+def test_failed_thin_plates_are_found_again():
+    # the top is not joined to anything so it has no bounds for its flanges
+    top = geometry_object.Rect(0, 100, 100, 1.27, name='top')
+    web = geometry_object.Rect(10, 75, 1.27, 75, name='web')
+    collection = geometry_collection.GeometryCollection((top, web), name='broken')
+
+    for _ in range(2):
+        for attribute in ('top_flange', 'side_shear', 'geometry_objects'):
+            with pytest.raises(IndexError):
+                getattr(collection, attribute)